@@ -5,14 +5,30 @@ and names, generates relevant Wikipedia and official Unicode charts URLs,
 and then performs web scraping on the Wikipedia URLs to fetch a two-paragraph
 summary for each block.
 
-The structured data, including the scraped description, is written to a JSON
-file named unicode_blocks.json.
+The structured data is written as two JSON files: unicode_blocks.json, a lean
+range index (name, start, end) that is cheap to load, and
+unicode_block_descriptions.json, which holds the URLs and scraped descriptions
+and is only read when header comments are generated.
+
+Every scraped block is appended to a journal file as soon as it is fetched, so
+an interrupted run can be resumed and only pays for the blocks still missing.
+
+Descriptions can also be read offline from saved Wikipedia article HTML (a
+directory, or a .zip/.tar.* archive of it), parsed in parallel with the same
+paragraph-extraction rules as the scraper.
 """
+import argparse
+import gzip
 import json
+import os
 import re
+import tarfile
 import time
-from typing import Dict, List, Optional
-from urllib.parse import quote
+import zipfile
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote
 
 import requests
 from bs4 import BeautifulSoup, Tag
@@ -21,6 +37,10 @@ from bs4 import BeautifulSoup, Tag
 # Define the input and output file names
 INPUT_FILE = "Blocks.txt"
 OUTPUT_FILE = "unicode_blocks.json"
+DESCRIPTIONS_FILE = "unicode_block_descriptions.json"
+
+# Journal of already scraped blocks (JSON Lines), kept next to the output file
+JOURNAL_SUFFIX = ".journal"
 
 # Base URLs for generating links
 WIKI_BASE_URL = "https://en.wikipedia.org/wiki/"
@@ -35,6 +55,9 @@ VERSION_RE = re.compile(r'# Blocks-(\d+\.\d+\.\d+)\.txt')
 # Define a delay between web requests to be a polite scraper (e.g., 0.5 seconds)
 SLEEP_DELAY = 0.5
 
+# File name suffixes of saved article HTML (optionally gzip-compressed)
+HTML_SUFFIXES = (".html", ".htm")
+
 # Define a common User-Agent string to help Wikipedia identify the request
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -72,7 +95,7 @@ def generate_charts_url(start_code_hex: str) -> str:
 
 # --- Web Scraper Function ---
 
-def scrape_wikipedia_summary(url: str, num_paragraphs: int = 2) -> str:
+def scrape_wikipedia_summary(url: str, num_paragraphs: int = 2, raise_errors: bool = False) -> str:
     """
     Fetches a Wikipedia article and extracts the first N paragraphs of the summary.
     Only returns content on a successful HTTP 200 status code.
@@ -80,6 +103,8 @@ def scrape_wikipedia_summary(url: str, num_paragraphs: int = 2) -> str:
     Args:
         url: The full URL of the Wikipedia article.
         num_paragraphs: The number of paragraphs to extract for the description.
+        raise_errors: Re-raise connection errors and timeouts instead of
+            returning "", so callers can tell them apart from missing articles.
 
     Returns:
         A string containing the concatenated paragraphs, or an empty string ("") 
@@ -91,6 +116,8 @@ def scrape_wikipedia_summary(url: str, num_paragraphs: int = 2) -> str:
 
     except requests.exceptions.RequestException:
         # Handle connection errors, timeouts, etc.
+        if raise_errors:
+            raise
         return ""
 
     # --- CRITICAL CHANGE: Only proceed if status code is 200 ---
@@ -98,8 +125,19 @@ def scrape_wikipedia_summary(url: str, num_paragraphs: int = 2) -> str:
         return ""
     # -----------------------------------------------------------
 
+    return extract_wikipedia_summary(response.content, num_paragraphs)
+
+def extract_wikipedia_summary(html: Union[str, bytes], num_paragraphs: int = 2) -> str:
+    """
+    Extracts the first N paragraphs of the summary from the HTML of a Wikipedia
+    article, as fetched live or saved to disk.
+
+    Returns:
+        A string containing the paragraphs separated by a blank line, or an
+        empty string ("") if the article content could not be found.
+    """
     # Parse the HTML content
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(html, 'html.parser')
 
     # Wikipedia article content is typically within a div with class 'mw-parser-output'
     parser_output: Optional[Tag] = soup.find('div', class_='mw-parser-output')
@@ -132,17 +170,260 @@ def scrape_wikipedia_summary(url: str, num_paragraphs: int = 2) -> str:
     else:
         return ""
 
+# --- Offline Article Source ---
+
+def article_key(title: str) -> str:
+    """
+    Normalizes an article title, as in a Wikipedia URL or a saved file name,
+    to the key used to match articles to blocks (e.g. 'Latin-1 Supplement'
+    and 'Latin_1_Supplement' both give 'latin_1_supplement').
+    """
+    return unquote(title).strip().replace(' ', '_').replace('-', '_').casefold()
+
+def saved_article_key(path: str) -> Optional[str]:
+    """
+    Returns the article key of a saved article file (e.g. 'html/Basic_Latin.html.gz'),
+    or None if the file is not article HTML.
+    """
+    file_name = path.replace("\\", "/").rsplit("/", 1)[-1]
+    if file_name.lower().endswith(".gz"):
+        file_name = file_name[:-3]
+    stem, ext = os.path.splitext(file_name)
+    if ext.lower() not in HTML_SUFFIXES:
+        return None
+    return article_key(stem)
+
+def read_saved_article(path: str) -> bytes:
+    """Reads one saved article file, decompressing it if it ends in .gz."""
+    opener = gzip.open if path.lower().endswith(".gz") else open
+    with opener(path, 'rb') as f:
+        return f.read()
+
+def summarize_saved_article(path: str, num_paragraphs: int = 2) -> str:
+    """Worker: reads a saved article file and extracts its summary."""
+    return extract_wikipedia_summary(read_saved_article(path), num_paragraphs)
+
+def summarize_archived_article(member_name: str, content: bytes, num_paragraphs: int = 2) -> str:
+    """Worker: extracts the summary of an archive member, decompressing it if it ends in .gz."""
+    if member_name.lower().endswith(".gz"):
+        content = gzip.decompress(content)
+    return extract_wikipedia_summary(content, num_paragraphs)
+
+def iter_archive_articles(archive_file: str, wanted: Dict[str, List[str]]) -> Iterator[Tuple[str, str, bytes]]:
+    """
+    Yields (article key, member name, raw content) for the members of a .zip
+    or .tar(.gz/.bz2/.xz) archive whose key is in `wanted`, reading the
+    archive sequentially. Members ending in .gz are yielded still compressed.
+    """
+    if zipfile.is_zipfile(archive_file):
+        with zipfile.ZipFile(archive_file) as archive:
+            for member in archive.infolist():
+                key = None if member.is_dir() else saved_article_key(member.filename)
+                if key in wanted:
+                    yield key, member.filename, archive.read(member)
+    elif tarfile.is_tarfile(archive_file):
+        with tarfile.open(archive_file, 'r:*') as archive:
+            for member in archive:
+                key = saved_article_key(member.name) if member.isfile() else None
+                if key in wanted:
+                    yield key, member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"'{archive_file}' is neither a directory nor a .zip/.tar archive")
+
+def load_offline_descriptions(source: str, block_names: List[str], jobs: Optional[int] = None, num_paragraphs: int = 2) -> Dict[str, str]:
+    """
+    Extracts the descriptions of the given blocks from saved article HTML
+    instead of the live site.
+
+    `source` is a directory (searched recursively) or a .zip/.tar.* archive of
+    article files named after the article, as in the block's Wikipedia URL
+    (e.g. Basic_Latin.html, optionally .gz compressed). The files are parsed in
+    parallel on `jobs` processes (default: one per core).
+
+    A file that cannot be read or decompressed (e.g. a truncated .gz) is
+    reported and its blocks are left out, like blocks without a saved article.
+
+    Returns:
+        A dict mapping block name to description for every block whose
+        article was found and read.
+    """
+    wanted: Dict[str, List[str]] = {}
+    for block_name in block_names:
+        wanted.setdefault(article_key(block_name), []).append(block_name)
+
+    descriptions: Dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # The first file found for an article wins
+        futures: Dict[str, Tuple[str, Future]] = {}
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for file_name in sorted(files):
+                    key = saved_article_key(file_name)
+                    if key in wanted and key not in futures:
+                        path = os.path.join(root, file_name)
+                        futures[key] = (path, pool.submit(summarize_saved_article, path, num_paragraphs))
+        else:
+            for key, member_name, content in iter_archive_articles(source, wanted):
+                if key not in futures:
+                    futures[key] = (member_name, pool.submit(summarize_archived_article, member_name, content, num_paragraphs))
+
+        for key, (file_name, future) in futures.items():
+            try:
+                description = future.result()
+            except (EOFError, OSError, zlib.error) as e:
+                print(f"⚠️ Skipping unreadable saved article '{file_name}': {e}")
+                continue
+            for block_name in wanted[key]:
+                descriptions[block_name] = description
+    return descriptions
+
+# --- Checkpoint Journal ---
+
+def get_journal_path(output_file: str) -> str:
+    """Returns the path of the checkpoint journal belonging to an output file."""
+    return output_file + JOURNAL_SUFFIX
+
+def load_journal(journal_file: str, unicode_version: str) -> Dict[Tuple[str, str], Dict[str, str]]:
+    """
+    Reads the block entries already scraped by a previous, interrupted run.
+
+    The first line of the journal records the Unicode version; a journal for a
+    different version is ignored. A truncated last line (e.g. from a crash
+    mid-write) is skipped.
+
+    Returns:
+        A dict mapping (block name, start hex) to the journaled block entry.
+    """
+    entries: Dict[Tuple[str, str], Dict[str, str]] = {}
+    try:
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("unicode_version") != unicode_version:
+                print(f"Ignoring journal '{journal_file}' (written for Unicode v{header.get('unicode_version')}).")
+                return entries
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[(entry["name"], entry["start"])] = entry
+    except FileNotFoundError:
+        pass
+    except (json.JSONDecodeError, KeyError, AttributeError):
+        print(f"Ignoring unreadable journal '{journal_file}'.")
+        entries.clear()
+    return entries
+
+def open_journal(journal_file: str, unicode_version: str, resume: bool):
+    """
+    Opens the journal for appending. A new journal (or one that is not being
+    resumed) starts with a header line recording the Unicode version.
+    """
+    if resume and os.path.exists(journal_file):
+        return open(journal_file, 'a', encoding='utf-8')
+    f = open(journal_file, 'w', encoding='utf-8')
+    f.write(json.dumps({"unicode_version": unicode_version}) + "\n")
+    f.flush()
+    return f
+
+def append_journal(journal, block_entry: Dict[str, str]) -> None:
+    """Appends one block entry to the journal and forces it to disk."""
+    journal.write(json.dumps(block_entry) + "\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+
+def write_json_atomic(output_file: str, data: Dict) -> None:
+    """
+    Writes the JSON data to a temporary file next to the output and renames it
+    into place, so readers never see a half-written unicode_blocks.json.
+    """
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, output_file)
+
+def write_block_data(output_file: str, descriptions_file: str, unicode_version: str, blocks_data: List[Dict[str, str]]) -> None:
+    """
+    Splits the collected block entries into the range index (output_file) and
+    the description/URL store (descriptions_file, keyed by block name) and
+    writes both atomically.
+    """
+    index_data = {
+        "unicode_version": unicode_version,
+        "blocks": [{"name": b["name"], "start": b["start"], "end": b["end"]} for b in blocks_data]
+    }
+    descriptions_data = {
+        "unicode_version": unicode_version,
+        "blocks": {
+            b["name"]: {
+                "wikipedia_url": b["wikipedia_url"],
+                "unicode_charts_url": b["unicode_charts_url"],
+                "description": b["description"]
+            }
+            for b in blocks_data
+        }
+    }
+    # Write the store first so a fresh index never points at stale descriptions
+    write_json_atomic(descriptions_file, descriptions_data)
+    write_json_atomic(output_file, index_data)
+
 # --- Main Logic ---
 
-def generate_block_data(input_file: str, output_file: str):
+def parse_blocks_file(input_file: str) -> List[Tuple[str, str, str]]:
+    """
+    Parses Blocks.txt into a list of (start hex, end hex, block name) tuples,
+    with the hex values upper-cased and zero-padded to at least four digits.
+    """
+    blocks: List[Tuple[str, str, str]] = []
+    with open(input_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            match = BLOCK_RE.match(line)
+            if match:
+                start_code_hex = match.group(1).upper().zfill(4)
+                end_code_hex = match.group(2).upper().zfill(4)
+                blocks.append((start_code_hex, end_code_hex, match.group(3).strip()))
+    return blocks
+
+def build_block_entry(start_code_hex: str, end_code_hex: str, block_name: str, description: str) -> Dict[str, str]:
+    """Builds the entry of one block, with its generated Wikipedia and charts URLs."""
+    return {
+        "name": block_name,
+        "start": start_code_hex,
+        "end": end_code_hex,
+        "wikipedia_url": generate_wikipedia_url(block_name),
+        "unicode_charts_url": generate_charts_url(start_code_hex),
+        "description": description # This is "" if scraping failed
+    }
+
+def generate_block_data(input_file: str, output_file: str, resume: bool = True, descriptions_file: str = DESCRIPTIONS_FILE,
+                        html_source: Optional[str] = None, jobs: Optional[int] = None):
     """
     Parses Blocks.txt, generates metadata, scrapes Wikipedia for descriptions,
     and writes the structured data (an object with unicode_version and blocks array) 
-    to a JSON file.
+    to the range index and description store JSON files.
+
+    Each scraped block is checkpointed to a journal next to the output file.
+    With `resume`, blocks already in the journal are not fetched again. Blocks
+    whose request failed with a network error are not journaled, so a re-run
+    retries exactly those. The journal is removed once every block succeeded.
+
+    With `html_source`, descriptions are read from saved article HTML instead
+    (see `load_offline_descriptions`); nothing is fetched and no journal is used.
 
     Args:
         input_file: The path to the source Blocks.txt file.
-        output_file: The path to the destination JSON file.
+        output_file: The path to the destination range index JSON file.
+        resume: Reuse the entries of an existing journal.
+        descriptions_file: The path to the destination description store.
+        html_source: A directory or archive of saved Wikipedia article HTML.
+        jobs: The number of processes parsing saved articles (default: one per core).
     """
     blocks_data: List[Dict[str, str]] = []
     
@@ -152,43 +433,7 @@ def generate_block_data(input_file: str, output_file: str):
     print(f"Starting data generation and scraping for Unicode v{unicode_version}...")
 
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-
-                match = BLOCK_RE.match(line)
-
-                if match:
-                    start_code_raw = match.group(1).upper()
-                    block_name = match.group(3).strip()
-                    
-                    # Generate URLs
-                    wiki_url = generate_wikipedia_url(block_name)
-
-                    # --- Web Scraping Step ---
-                    print(f"-> Scraping summary for: {block_name}...")
-                    description = scrape_wikipedia_summary(wiki_url)
-                    
-                    # Be a polite scraper: wait for a moment between requests
-                    time.sleep(SLEEP_DELAY) 
-                    # -------------------------
-                    
-                    end_code_raw = match.group(2).upper()
-                    start_code_hex = start_code_raw.zfill(4)
-                    end_code_hex = end_code_raw.zfill(4)
-                    
-                    block_entry = {
-                        "name": block_name,
-                        "start": start_code_hex,
-                        "end": end_code_hex,
-                        "wikipedia_url": wiki_url,
-                        "unicode_charts_url": generate_charts_url(start_code_hex),
-                        "description": description # This is "" if scraping failed
-                    }
-                    blocks_data.append(block_entry)
-
+        blocks = parse_blocks_file(input_file)
     except FileNotFoundError:
         print(f"❌ Error: Input file '{input_file}' not found. Please ensure it exists.")
         return
@@ -196,20 +441,116 @@ def generate_block_data(input_file: str, output_file: str):
         print(f"❌ An unexpected error occurred while processing '{input_file}': {e}")
         return
 
-    # --- Write the collected data as an object including version ---
-    final_data = {
-        "unicode_version": unicode_version,
-        "blocks": blocks_data
-    }
-    
+    if html_source:
+        print(f"Reading descriptions from saved articles in '{html_source}'...")
+        try:
+            descriptions = load_offline_descriptions(html_source, [block_name for _, _, block_name in blocks], jobs)
+        except (OSError, ValueError, tarfile.TarError, zipfile.BadZipFile) as e:
+            print(f"❌ Error reading saved articles from '{html_source}': {e}")
+            return
+        blocks_data = [
+            build_block_entry(start_code_hex, end_code_hex, block_name, descriptions.get(block_name, ""))
+            for start_code_hex, end_code_hex, block_name in blocks
+        ]
+        missing = [block_name for _, _, block_name in blocks if block_name not in descriptions]
+        try:
+            write_block_data(output_file, descriptions_file, unicode_version, blocks_data)
+            print(f"\n✅ Successfully generated block data for {len(blocks_data)} blocks (Unicode v{unicode_version}) into '{output_file}' and '{descriptions_file}'.")
+        except Exception as e:
+            print(f"❌ Error writing to output file '{output_file}': {e}")
+            return
+        if missing:
+            print(f"⚠️ {len(missing)} blocks have no readable saved article and have empty descriptions (e.g. '{missing[0]}').")
+        return
+
+    journal_file = get_journal_path(output_file)
+    journaled = load_journal(journal_file, unicode_version) if resume else {}
+    if journaled:
+        print(f"Resuming from '{journal_file}': {len(journaled)} blocks already scraped.")
+
+    failed_blocks: List[str] = []
+
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(final_data, f, indent=4) # Dump the new object structure
+        with open_journal(journal_file, unicode_version, resume=bool(journaled)) as journal:
+            for start_code_hex, end_code_hex, block_name in blocks:
+                block_entry = journaled.get((block_name, start_code_hex))
+                if block_entry is not None:
+                    blocks_data.append(block_entry)
+                    continue
+
+                # --- Web Scraping Step ---
+                print(f"-> Scraping summary for: {block_name}...")
+                try:
+                    description = scrape_wikipedia_summary(generate_wikipedia_url(block_name), raise_errors=True)
+                    fetched = True
+                except requests.exceptions.RequestException as e:
+                    print(f"   ⚠️ Request failed ({e}); will retry on the next run.")
+                    description = ""
+                    fetched = False
+                
+                # Be a polite scraper: wait for a moment between requests
+                time.sleep(SLEEP_DELAY) 
+                # -------------------------
+                
+                block_entry = build_block_entry(start_code_hex, end_code_hex, block_name, description)
+                blocks_data.append(block_entry)
+
+                if fetched:
+                    append_journal(journal, block_entry)
+                else:
+                    failed_blocks.append(block_name)
+
+    except KeyboardInterrupt:
+        print(f"\n⏸️ Interrupted. Progress is saved in '{journal_file}'; re-run to resume.")
+        return
+    except OSError as e:
+        print(f"❌ Error writing journal '{journal_file}': {e}")
+        return
+
+    # --- Write the collected data as an index and a description store ---
+    try:
+        write_block_data(output_file, descriptions_file, unicode_version, blocks_data)
             
-        print(f"\n✅ Successfully generated block data for {len(blocks_data)} blocks (Unicode v{unicode_version}) into '{output_file}'.")
+        print(f"\n✅ Successfully generated block data for {len(blocks_data)} blocks (Unicode v{unicode_version}) into '{output_file}' and '{descriptions_file}'.")
     except Exception as e:
         print(f"❌ Error writing to output file '{output_file}': {e}")
+        return
+
+    if failed_blocks:
+        print(f"⚠️ {len(failed_blocks)} blocks could not be fetched and have empty descriptions. Re-run to retry them.")
+    else:
+        os.remove(journal_file)
+
+
+def main() -> None:
+    """Parses the command line and runs the block data generation."""
+    parser = argparse.ArgumentParser(
+        description="Generate unicode_blocks.json from Blocks.txt and Wikipedia block summaries."
+    )
+    parser.add_argument('-i', '--input', default=INPUT_FILE, help=f'Path to Blocks.txt (default: {INPUT_FILE})')
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help=f'Path to the output range index JSON (default: {OUTPUT_FILE})')
+    parser.add_argument('-d', '--descriptions-output', default=DESCRIPTIONS_FILE, help=f'Path to the output description store JSON (default: {DESCRIPTIONS_FILE})')
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help=f'Ignore an existing journal ({OUTPUT_FILE}{JOURNAL_SUFFIX}) and scrape every block again'
+    )
+    parser.add_argument(
+        '--html-source',
+        default=None,
+        help='Read descriptions offline from saved Wikipedia article HTML: a directory or a .zip/.tar.gz archive of files named like Basic_Latin.html'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of processes parsing saved articles with --html-source (default: one per core)'
+    )
+    args = parser.parse_args()
+
+    generate_block_data(args.input, args.output, resume=not args.no_resume, descriptions_file=args.descriptions_output,
+                        html_source=args.html_source, jobs=args.jobs)
 
 
 if __name__ == "__main__":
-    generate_block_data(INPUT_FILE, OUTPUT_FILE)
+    main()
@@ -18,12 +18,22 @@ import re
 import sys
 import argparse
 import json 
-from typing import Dict, List, Set, Tuple, Optional, Iterator
-from collections import namedtuple
+import os
+import bisect
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Set, Tuple, Optional, Iterator
+from collections import namedtuple, deque
+# concurrent.futures, hashlib, shlex, subprocess and tempfile are imported where
+# they are used (writer pool, stamps, PCH), so `block()` users do not pay for them
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
 
 # Import all standard functions from unicodedata2 for updated Unicode data.
 # Added 'lookup' for robust name-based case mapping.
-from unicodedata2 import name, category, unidata_version, lookup
+import unicodedata2
+from unicodedata2 import unidata_version
 
 
 # Global constant for unicodedata version (from package)
@@ -35,19 +45,38 @@ UNICODE_BLOCK_VERSION: str = "N/A (not loaded)"
 # Define the structure for a Unicode Block
 UnicodeBlock = namedtuple('UnicodeBlock', ['name', 'start', 'end', 'description', 'wikipedia_url', 'unicode_charts_url'])
 
+# Define the structure for one generated #define (cp2 is 0 for single code points)
+MacroEntry = namedtuple('MacroEntry', ['macro_name', 'cp1', 'cp2', 'comment'])
+
+# UCD providers that can be loaded side by side in one process. Each one exposes
+# the same name/category/lookup/unidata_version API as the unicodedata module.
+UCD_SOURCES: Dict[str, Any] = {
+    "unicodedata2": unicodedata2,
+    "unicodedata": unicodedata,
+    "unicodedata-3.2.0": unicodedata.ucd_3_2_0,
+}
+
 # --------------------------------------------------------------------
 # 0. Block Data Loading, Caching, and 'block' function
 # --------------------------------------------------------------------
 
 BLOCKS_DATA_FILE = "unicode_blocks.json"
+BLOCK_DESCRIPTIONS_FILE = "unicode_block_descriptions.json"
 _CACHED_BLOCK_DATA: Optional[List[Dict]] = None
+_BLOCK_STARTS: List[int] = []
+_CACHED_BLOCK_DESCRIPTIONS: Optional[Dict[str, Dict[str, str]]] = None
 
 def load_block_data() -> None:
     """
-    Loads and caches the block data from the JSON file. Converts hexadecimal 
+    Loads and caches the block range index from the JSON file. Converts hexadecimal 
     start/end strings to integers for fast lookup and sets the global Unicode block version.
+
+    The index only holds names and ranges; descriptions and URLs live in
+    BLOCK_DESCRIPTIONS_FILE and are only read by `load_block_descriptions`.
+    A legacy combined file (with descriptions inline) is still accepted.
     """
     global _CACHED_BLOCK_DATA
+    global _BLOCK_STARTS
     global UNICODE_BLOCK_VERSION
 
     if _CACHED_BLOCK_DATA is None:
@@ -70,6 +99,7 @@ def load_block_data() -> None:
                     processed_blocks.append(block_entry)
                     
                 _CACHED_BLOCK_DATA = processed_blocks
+                _BLOCK_STARTS = [entry['start_cp'] for entry in processed_blocks]
 
         except FileNotFoundError:
             print(f"Error: Block data file '{BLOCKS_DATA_FILE}' not found.", file=sys.stderr)
@@ -82,33 +112,65 @@ def load_block_data() -> None:
             print(f"Error: Missing key {e} in a block entry in JSON file. Check block format.", file=sys.stderr)
             sys.exit(1)
 
+def load_block_descriptions() -> Dict[str, Dict[str, str]]:
+    """
+    Lazily loads and caches the description/URL store, keyed by block name.
+    A missing store is not an error: headers are then written without the
+    description and link comments.
+    """
+    global _CACHED_BLOCK_DESCRIPTIONS
+
+    if _CACHED_BLOCK_DESCRIPTIONS is None:
+        try:
+            with open(BLOCK_DESCRIPTIONS_FILE, 'r', encoding='utf-8') as f:
+                _CACHED_BLOCK_DESCRIPTIONS = json.load(f).get('blocks', {})
+        except FileNotFoundError:
+            _CACHED_BLOCK_DESCRIPTIONS = {}
+        except json.JSONDecodeError:
+            print(f"Error: Invalid JSON in '{BLOCK_DESCRIPTIONS_FILE}'.", file=sys.stderr)
+            sys.exit(1)
+    return _CACHED_BLOCK_DESCRIPTIONS
+
+def reset_block_data() -> None:
+    """Drops the cached block index and description store so they are re-read on next use."""
+    global _CACHED_BLOCK_DATA
+    global _CACHED_BLOCK_DESCRIPTIONS
+    _CACHED_BLOCK_DATA = None
+    _CACHED_BLOCK_DESCRIPTIONS = None
+
 def block(cp: int) -> str:
     """
     Custom 'block' function that determines the Unicode block name for a code point.
+    Only the range index is needed; the description store is never loaded.
     """
     if _CACHED_BLOCK_DATA is None:
         load_block_data()
-        
-    for entry in _CACHED_BLOCK_DATA:
-        if entry['start_cp'] <= cp <= entry['end_cp']:
-            return entry['name']
+
+    index = bisect.bisect_right(_BLOCK_STARTS, cp) - 1
+    if index >= 0 and cp <= _CACHED_BLOCK_DATA[index]['end_cp']:
+        return _CACHED_BLOCK_DATA[index]['name']
     return 'No_Block'
 
-def get_all_blocks() -> Iterator[UnicodeBlock]:
+def get_all_blocks(with_descriptions: bool = True) -> Iterator[UnicodeBlock]:
     """
     Generator yielding UnicodeBlock namedtuples from the cached data.
+    With `with_descriptions=False` the description store is not loaded and
+    the description/URL fields are empty.
     """
     if _CACHED_BLOCK_DATA is None:
         load_block_data()
+
+    descriptions = load_block_descriptions() if with_descriptions else {}
         
     for entry in _CACHED_BLOCK_DATA:
+        info = descriptions.get(entry['name'], entry) if with_descriptions else {}
         yield UnicodeBlock(
             name=entry['name'], 
             start=entry['start_cp'], 
             end=entry['end_cp'],
-            description=entry.get('description', ''),
-            wikipedia_url=entry.get('wikipedia_url', ''),
-            unicode_charts_url=entry.get('unicode_charts_url', '')
+            description=info.get('description', ''),
+            wikipedia_url=info.get('wikipedia_url', ''),
+            unicode_charts_url=info.get('unicode_charts_url', '')
         )
 
 # --------------------------------------------------------------------
@@ -117,11 +179,251 @@ def get_all_blocks() -> Iterator[UnicodeBlock]:
 
 MAX_UNICODE_CP = 0x110000 
 
+# Categories to EXCLUDE (Unassigned, Private Use, Surrogate, Specific Separators)
+EXCLUDE_CATEGORIES = frozenset({'Cn', 'Co', 'Cs', 'Zl', 'Zp'})
+
+# Upper-case hex digits of a code point suffix in a Unicode name (see AbbreviationEngine)
+HEX_DIGITS = "0123456789ABCDEF"
+
+# Format version of the --registry file (see load_name_registry)
+NAME_REGISTRY_FORMAT = 1
+# Registry names are pasted into #define lines as-is
+C_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# Block abbreviations are pasted between "UC_" and the name body (empty means no prefix)
+BLOCK_ABBREVIATION_RE = re.compile(r"[A-Za-z0-9_]*")
+
+
+class CodePointInfo:
+    """
+    The properties of one code point, computed exactly once per block and
+    shared by every later stage (case pairing, naming and comment formatting).
+    """
+    __slots__ = ('cp', 'char', 'cat', 'name', 'glyph')
+
+    def __init__(self, cp: int, char: str, cat: str, name: str, glyph: Optional[str]):
+        self.cp = cp
+        self.char = char
+        self.cat = cat
+        self.name = name
+        self.glyph = glyph
+
 
 # --------------------------------------------------------------------
 # 2. Utility Class for Macro Generation (Encapsulation)
 # --------------------------------------------------------------------
 
+class AbbreviationEngine:
+    """
+    Compiled form of the abbreviation rules (layers 2 and 3 plus case-word
+    stripping) used by `MacroGenerator.generate_name`.
+
+    All string replacements and separator clean-up are compiled into a single
+    regex alternation (longest key first) that is applied in one pass per
+    word, and redundant-word removal is a set lookup on the resulting tokens.
+    Because no rule spans a space, each distinct word of a Unicode name is
+    processed only once and memoized, so repeated fragments such as "LATIN",
+    "LETTER" or "WITH" cost a dict lookup however many rules there are.
+
+    Names that end in a code point ("CJK UNIFIED IDEOGRAPH-20000", "TANGUT
+    IDEOGRAPH-17000") would add a word to the memo that never occurs again.
+    Their hex suffix is split off and appended as its own token to the
+    memoized body of the rest of the name instead, which gives the same
+    result unless a replacement key could match across the hyphen or inside
+    the hex digits (then such names take the normal path).
+    """
+
+    def __init__(self, replacements: Dict[str, str], redundant_words: Set[str], case_words: Set[str]):
+        for original in replacements:
+            if not original or any(ch.isspace() for ch in original):
+                raise ValueError(f"Abbreviation key {original!r} must be a single, non-empty word")
+
+        self._case_words = frozenset(w.upper() for w in case_words)
+        self._redundant_words = frozenset(w.upper() for w in redundant_words)
+        # Replacement values are sanitized up front so the output never needs a second pass
+        self._replacements: Dict[str, str] = {
+            original.upper(): re.sub(r"[^\w]+", "_", replacement.upper())
+            for original, replacement in replacements.items()
+        }
+        self._split_hex_suffix = not any(
+            re.search(r"-([0-9A-F]|$)", k) or re.fullmatch(r"[0-9A-F]+", k) for k in self._replacements
+        )
+        alternatives = [re.escape(k) for k in sorted(self._replacements, key=len, reverse=True)]
+        alternatives.append(r"[^\w]+")
+        self._pattern = re.compile("|".join(alternatives))
+        self._word_cache: Dict[str, Tuple[str, ...]] = {}
+        self._prefix_cache: Dict[Tuple[str, bool], str] = {}
+
+    def changed_rules(self, other: 'AbbreviationEngine') -> Tuple[Set[str], Set[str], Set[str]]:
+        """
+        Returns the rules that differ between this engine and *other*, as
+        (replacement keys, redundant words, case words).
+
+        A name abbreviates identically under both engines if none of the
+        replacement keys is a substring of it, none of the redundant words is
+        one of its `replaced_tokens`, and none of the case words is one of its
+        words. (If no changed replacement key occurs in a name, both engines
+        produce the same replaced tokens for it.)
+        """
+        replacement_keys = {
+            k for k in set(self._replacements) | set(other._replacements)
+            if self._replacements.get(k) != other._replacements.get(k)
+        }
+        return (
+            replacement_keys,
+            set(self._redundant_words ^ other._redundant_words),
+            set(self._case_words ^ other._case_words),
+        )
+
+    def _substitute(self, match: 're.Match[str]') -> str:
+        return self._replacements.get(match.group(), "_")
+
+    def replaced_tokens(self, word: str) -> List[str]:
+        """Applies the replacements to one upper-case word and splits it into tokens (not memoized)."""
+        return [t for t in self._pattern.sub(self._substitute, word).split("_") if t]
+
+    def _word_tokens(self, word: str) -> Tuple[str, ...]:
+        """Applies replacements and redundant-word removal to one word (memoized)."""
+        tokens = self._word_cache.get(word)
+        if tokens is None:
+            redundant_words = self._redundant_words
+            tokens = tuple(t for t in self._pattern.sub(self._substitute, word).split("_") if t and t not in redundant_words)
+            self._word_cache[word] = tokens
+        return tokens
+
+    def abbreviate(self, unicode_name: str, strip_case: bool) -> str:
+        """
+        Returns the shortened, underscore-separated body of a macro name
+        (without the UC_ and block prefixes), or "" if nothing is left.
+        """
+        name = unicode_name.upper()
+        if self._split_hex_suffix:
+            head, hyphen, tail = name.rpartition("-")
+            if hyphen and len(tail) >= 4 and not tail.strip(HEX_DIGITS):
+                # The prefix is shared by a whole block (e.g. "CJK UNIFIED IDEOGRAPH-")
+                key = (head, strip_case)
+                prefix = self._prefix_cache.get(key)
+                if prefix is None:
+                    prefix = self._prefix_cache[key] = self._abbreviate_words(head + hyphen, strip_case)
+                if tail in self._redundant_words:
+                    return prefix
+                return f"{prefix}_{tail}" if prefix else tail
+        return self._abbreviate_words(name, strip_case)
+
+    def _abbreviate_words(self, name: str, strip_case: bool) -> str:
+        """`abbreviate` for an upper-case name, word by word."""
+        words = name.split()
+        if strip_case:
+            # A case word is only stripped when another word follows it
+            words = [w for w in words[:-1] if w not in self._case_words] + words[-1:]
+
+        word_tokens = self._word_tokens
+        return "_".join(t for w in words for t in word_tokens(w))
+
+
+def load_abbreviation_config(path: str) -> Dict[str, Any]:
+    """
+    Loads a JSON abbreviation config that extends (or, with
+    "replace_defaults": true, replaces) the built-in MacroGenerator tables:
+
+        {
+            "block_abbreviations": {"TAMIL SUPPLEMENT": "TMS"},
+            "replacements": {"SUPERSCRIPT": "SUP"},
+            "redundant_words": ["SIGN"],
+            "case_words": ["SMALL", "CAPITAL"]
+        }
+
+    Mappings must map strings to strings and word lists must be lists of
+    strings. Replacement keys are matched within single words, so they must
+    not contain spaces, and block abbreviations may only contain letters,
+    digits and underscores. Any other content exits with an error.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Abbreviation config '{path}' not found.", file=sys.stderr)
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in '{path}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not isinstance(config, dict):
+        print(f"Error: Abbreviation config '{path}' must contain a JSON object.", file=sys.stderr)
+        sys.exit(1)
+
+    problems: List[str] = []
+    for key, value in config.items():
+        if key in ("block_abbreviations", "replacements"):
+            if not isinstance(value, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in value.items()):
+                problems.append(f"'{key}' must map strings to strings")
+            elif key == "replacements":
+                problems.extend(
+                    f"replacement key {k!r} must be a single, non-empty word"
+                    for k in value if not k or any(ch.isspace() for ch in k)
+                )
+            else:
+                problems.extend(
+                    f"block abbreviation {v!r} for {k!r} may only contain letters, digits and underscores"
+                    for k, v in value.items() if not BLOCK_ABBREVIATION_RE.fullmatch(v)
+                )
+        elif key in ("redundant_words", "case_words"):
+            if not isinstance(value, list) or not all(isinstance(w, str) for w in value):
+                problems.append(f"'{key}' must be a list of strings")
+        elif key == "replace_defaults":
+            if not isinstance(value, bool):
+                problems.append("'replace_defaults' must be true or false")
+        else:
+            problems.append(f"unknown key '{key}'")
+    if problems:
+        print(f"Error: Invalid abbreviation config '{path}': {'; '.join(problems)}.", file=sys.stderr)
+        sys.exit(1)
+    return config
+
+def load_name_registry(path: str) -> Dict[int, str]:
+    """
+    Loads a macro name registry written by `build_name_registry_content`:
+
+        {
+            "format": 1,
+            "names": {"0030": "UC_LA_ZERO", "0061": "UC_LA_A", ...}
+        }
+
+    Returns a dict mapping code point (the first code point of the macro) to
+    its assigned name. A missing file is an empty registry (the first run
+    creates it).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in '{path}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not isinstance(data, dict) or data.get("format") != NAME_REGISTRY_FORMAT or not isinstance(data.get("names"), dict):
+        print(f"Error: '{path}' is not a macro name registry (format {NAME_REGISTRY_FORMAT}).", file=sys.stderr)
+        sys.exit(1)
+    try:
+        registry = {int(cp_hex, 16): macro_name for cp_hex, macro_name in data["names"].items()}
+    except ValueError as e:
+        print(f"Error: Invalid code point in '{path}': {e}", file=sys.stderr)
+        sys.exit(1)
+    invalid = [repr(macro_name) for macro_name in registry.values() if not isinstance(macro_name, str) or not C_IDENTIFIER_RE.fullmatch(macro_name)]
+    if invalid:
+        print(f"Error: Macro name registry '{path}' contains names that are not C identifiers: {', '.join(invalid[:5])}.", file=sys.stderr)
+        sys.exit(1)
+    if len(set(registry.values())) != len(registry):
+        print(f"Error: Macro name registry '{path}' assigns the same name to several code points.", file=sys.stderr)
+        sys.exit(1)
+    return registry
+
+def build_name_registry_content(registry: Dict[int, str]) -> str:
+    """Serializes a code point -> macro name registry, sorted by code point (one entry per line)."""
+    lines = [f"        {json.dumps(f'{cp:04X}')}: {json.dumps(registry[cp])}" for cp in sorted(registry)]
+    return f'{{\n    "format": {NAME_REGISTRY_FORMAT},\n    "names": {{\n' + ",\n".join(lines) + "\n    }\n}\n"
+
+
 class MacroGenerator:
     """
     Manages the configuration and logic for converting Unicode names into 
@@ -217,6 +519,9 @@ class MacroGenerator:
         "ADDITIONAL", "COMPATIBILITY", "IDEOGRAPHS", "VARIATION", "SELECTOR",
     }
 
+    # Words stripped from the name of a case pair (only when followed by another word)
+    CASE_WORDS: Set[str] = {"SMALL", "CAPITAL", "LOWERCASE", "UPPERCASE"}
+
     # Layer 3: Internal String Replacements
     MACRO_STRING_REPLACEMENTS: Dict[str, str] = {
         "SANS-SERIF": "SS",
@@ -231,52 +536,87 @@ class MacroGenerator:
         "FULLWIDTH": "FW",
     }
     
-    def __init__(self):
-        """Initializes the global set to track all macro names used across all blocks."""
-        self._used_macro_names: Set[str] = set()
+    def __init__(self, ucd: Any = unicodedata2, name_cache: Optional[Dict[Tuple[str, str, bool], str]] = None, warn: bool = True, config: Optional[Dict[str, Any]] = None,
+                 registry: Optional[Dict[int, str]] = None):
+        """
+        Initializes the global set to track all macro names used across all blocks.
+
+        `ucd` is the Unicode data provider (see UCD_SOURCES). Generators for several
+        UCD versions may share one `name_cache`, so a Unicode name that did not change
+        between versions is only abbreviated once. `config` is an abbreviation config
+        (see `load_abbreviation_config`) merged over the class-level tables.
+
+        `registry` maps code points to names assigned in earlier runs (see
+        `load_name_registry`). `claim_macro_name` returns their registered name
+        whatever the current rules produce, and all registry names are reserved
+        up front, so only new code points go through collision checks.
+        """
+        self.ucd = ucd
+        self.warn = warn
+        config = config or {}
+        replace_defaults = bool(config.get("replace_defaults", False))
+
+        def merged(default, key):
+            extra = config.get(key, {} if isinstance(default, dict) else [])
+            if isinstance(default, dict):
+                return dict(extra) if replace_defaults else {**default, **extra}
+            return set(extra) if replace_defaults else default | set(extra)
+
+        self.block_abbreviations: Dict[str, str] = {
+            k.upper(): v for k, v in merged(self.BLOCK_ABBREVIATIONS, "block_abbreviations").items()
+        }
+        self.block_abbreviations.setdefault("DEFAULT", "")
+        self.engine = AbbreviationEngine(
+            merged(self.MACRO_STRING_REPLACEMENTS, "replacements"),
+            merged(self.REDUNDANT_SCRIPT_WORDS, "redundant_words"),
+            merged(self.CASE_WORDS, "case_words"),
+        )
+        self.registry: Dict[int, str] = registry if registry is not None else {}
+        self._used_macro_names: Set[str] = set(self.registry.values())
+        # When set to a set, every name checked for collisions is recorded in it (see WatchSession)
+        self.probe_log: Optional[Set[str]] = None
+        # When set to a dict, maps each claimed code point to (tentative name, full name or None) (see run_shard)
+        self.candidate_log: Optional[Dict[int, Tuple[str, Optional[str]]]] = None
+        # Only generators that share a cache (see build_version_tables) see a name twice
+        self._name_cache: Optional[Dict[Tuple[str, str, bool], str]] = name_cache
+
+    def reserve_names(self, macro_names: Iterator[str]) -> None:
+        """Marks names as used without resolving them (e.g. for a block reused from a previous run)."""
+        self._used_macro_names.update(macro_names)
 
     def get_block_abbr(self, block_name: str) -> str:
         """Looks up the abbreviation for a Unicode block name."""
-        return self.BLOCK_ABBREVIATIONS.get(block_name.upper(), self.BLOCK_ABBREVIATIONS["DEFAULT"])
+        return self.block_abbreviations.get(block_name.upper(), self.block_abbreviations["DEFAULT"])
 
     def generate_name(self, block_abbr: str, unicode_name: str, strip_case: bool) -> str:
         """
         Build the primary (shortened) C‑identifier from the Unicode name.
         Applies all three layers of abbreviation.
         """
-        s = unicode_name
-        
-        # 1. Strip case words
-        if strip_case:
-            s = re.sub(r"(SMALL|CAPITAL|LOWERCASE|UPPERCASE)\s", "", s)
-        
-        s_upper = s.upper()
-
-        # 2. Layer 3: Apply internal abbreviations
-        for original, replacement in self.MACRO_STRING_REPLACEMENTS.items():
-            s_upper = s_upper.replace(original.upper(), replacement)
-
-        # 3. Initial cleanup: convert remaining spaces/hyphens/non-word chars to single underscores
-        s_final = re.sub(r"[^\w]+", "_", s_upper).strip("_")
-        
-        # 4. Layer 2: Filter out redundant words based on parts
-        s_parts = s_final.split('_')
-        s_final = '_'.join([part for part in s_parts if part not in self.REDUNDANT_SCRIPT_WORDS])
-            
-        # Final cleanup of internal underscores
-        s_final = re.sub(r"_+", "_", s_final).strip('_')
+        name_cache = self._name_cache
+        if name_cache is not None:
+            key = (block_abbr, unicode_name, strip_case)
+            cached = name_cache.get(key)
+            if cached is not None:
+                return cached
+
+        # Layers 2 and 3 (and case-word stripping) in one compiled pass
+        s_final = self.engine.abbreviate(unicode_name, strip_case)
         
         # Fallback
         if not s_final:
             s_final = "CHAR"
 
-        # 5. Assemble the final macro name
+        # Assemble the final macro name
         parts = ["UC"]
         if block_abbr:
             parts.append(block_abbr)
         parts.append(s_final)
 
-        return "_".join(parts)
+        macro_name = "_".join(parts)
+        if name_cache is not None:
+            name_cache[key] = macro_name
+        return macro_name
 
     def get_full_unshortened_name(self, cp: int, char: str, cat: str) -> str:
         """
@@ -301,6 +641,24 @@ class MacroGenerator:
         
         # 1. TENTATIVE SHORTENED NAME (Primary Goal)
         tentative_name = self.generate_name(block_abbr, unicode_name, strip_case)
+        return self.claim_macro_name(tentative_name, cp, lambda: self.get_full_unshortened_name(cp, char, cat))
+
+    def claim_macro_name(self, tentative_name: str, cp: int, full_name_of: Callable[[], str]) -> str:
+        """
+        Claims the first free name out of the tentative (shortened) name, the
+        full unshortened name and the full name with a `_UXXXX` suffix.
+
+        `full_name_of` is only called on a collision, so the full name is not
+        built for the vast majority of code points. A code point in the
+        registry always gets its registered name.
+        """
+        registered = self.registry.get(cp)
+        if registered is not None:
+            return registered
+        if self.probe_log is not None:
+            self.probe_log.add(tentative_name)
+        if self.candidate_log is not None:
+            self.candidate_log[cp] = (tentative_name, None)
         
         if tentative_name not in self._used_macro_names:
             # No collision: Use the shortened name.
@@ -308,8 +666,13 @@ class MacroGenerator:
             return tentative_name
         else:
             # Collision found with the shortened name. Revert to full unshortened name.
-            full_name = self.get_full_unshortened_name(cp, char, cat)
-            print(f"Warning: Collision detected for U+{cp:04X}. Shortened name '{tentative_name}' already used. Reverting to full name: '{full_name}'", file=sys.stderr)
+            full_name = full_name_of()
+            if self.probe_log is not None:
+                self.probe_log.add(full_name)
+            if self.candidate_log is not None:
+                self.candidate_log[cp] = (tentative_name, full_name)
+            if self.warn:
+                print(f"Warning: Collision detected for U+{cp:04X}. Shortened name '{tentative_name}' already used. Reverting to full name: '{full_name}'", file=sys.stderr)
             
             # 2. FULL UN-SHORTENED NAME (Fallback 1: User Preference)
             if full_name not in self._used_macro_names:
@@ -321,7 +684,8 @@ class MacroGenerator:
                 # We must break the constraint and use the code point suffix 
                 # to prevent a C compile error, but we log this as a fatal warning.
                 safe_name = f"{full_name}_U{cp:04X}"
-                print(f"FATAL COLLISION: Both shortened and full names ('{full_name}') clash for U+{cp:04X}. Appending code point suffix '{safe_name}' to ensure uniqueness.", file=sys.stderr)
+                if self.warn:
+                    print(f"FATAL COLLISION: Both shortened and full names ('{full_name}') clash for U+{cp:04X}. Appending code point suffix '{safe_name}' to ensure uniqueness.", file=sys.stderr)
                 self._used_macro_names.add(safe_name)
                 return safe_name
 
@@ -330,17 +694,20 @@ class MacroGenerator:
 # 3. Helper Functions 
 # --------------------------------------------------------------------
 
-def printable_glyph(cp: int) -> Optional[str]:
+def printable_glyph(cp: int, ucd: Any = unicodedata2) -> Optional[str]:
     """
     Returns the character if it's displayable (Letter, Number, Symbol, Punctuation), 
     otherwise returns None. Used only for comment formatting.
     """
     try:
         ch = chr(cp)
-        cat = category(ch)
+        cat = ucd.category(ch)
     except ValueError:
         return None
-        
+    return _glyph_for(ch, cat)
+
+def _glyph_for(ch: str, cat: str) -> Optional[str]:
+    """`printable_glyph` for a character whose category is already known."""
     # Filter out all C (Control, Format, Unassigned, Private Use, Surrogate)
     # and all Z (Separator), except for the standard space (U+0020).
     if cat[0] in ("C", "Z"):
@@ -358,20 +725,20 @@ def resolve_char_name(cp: int, char: str, cat: str, macro_generator: 'MacroGener
         return macro_generator.CONTROL_CHARACTER_NAMES[cp]
     else:
         try:
-            return name(char)
+            return macro_generator.ucd.name(char)
         except ValueError:
             # Fallback for assigned characters (like non-ASCII Cc or Cf) if name fails
             return f"{cat}_U{cp:04X}"
 
 
-def find_case_partner(cp: int, name1: str) -> Optional[int]:
+def find_case_partner(cp: int, name1: str, ucd: Any = unicodedata2, cat: Optional[str] = None) -> Optional[int]:
     """
     Find the uppercase partner code point if *cp* is a single, mappable 
-    lowercase letter ('Ll').
+    lowercase letter ('Ll'). Pass *cat* if the category is already known.
     """
     try:
         ch = chr(cp)
-        if category(ch) != 'Ll':
+        if (cat or ucd.category(ch)) != 'Ll':
             return None
     except ValueError:
         return None
@@ -380,11 +747,11 @@ def find_case_partner(cp: int, name1: str) -> Optional[int]:
     if ('SMALL' in name1) or ('LOWERCASE' in name1):
         partner_name = name1.replace('SMALL', 'CAPITAL').replace('LOWERCASE', 'UPPERCASE')
         try:
-            partner_ch = lookup(partner_name)
+            partner_ch = ucd.lookup(partner_name)
             partner_cp = ord(partner_ch)
             
             # Final check: ensure the partner is indeed an uppercase letter.
-            if category(partner_ch) == 'Lu':
+            if ucd.category(partner_ch) == 'Lu':
                 return partner_cp
 
         except (KeyError, ValueError):
@@ -398,7 +765,7 @@ def find_case_partner(cp: int, name1: str) -> Optional[int]:
         partner_cp = ord(partner_str)
         try:
             partner_ch = chr(partner_cp)
-            partner_cat = category(partner_ch)
+            partner_cat = ucd.category(partner_ch)
         except ValueError:
             return None
         
@@ -408,213 +775,257 @@ def find_case_partner(cp: int, name1: str) -> Optional[int]:
     return None
 
 
+def write_if_changed(path: pathlib.Path, content: str) -> bool:
+    """
+    Writes *content* to *path* only if the file does not already hold exactly
+    that text, so unchanged headers keep their mtime and do not trigger
+    rebuilds. Returns True if the file was written.
+    """
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+class HeaderWriter:
+    """
+    Bounded background writer pool for generated headers.
+
+    Writes run on worker threads so file I/O overlaps with generating the next
+    block. Results are reported on the main thread strictly in submission
+    order, so console output and the first error raised are deterministic.
+    At most `max_pending` writes are in flight; submitting more blocks until
+    the oldest one finishes. With `max_workers=0` every write is synchronous.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16):
+        self._executor: Optional['ThreadPoolExecutor'] = None
+        if max_workers > 0:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="header-writer")
+        self._max_pending = max(1, max_pending)
+        self._pending: Deque[Tuple[str, Optional[pathlib.Path], Optional['Future']]] = deque()
+
+    def submit(self, path: pathlib.Path, content: str, label: str) -> None:
+        """Queues *content* for `write_if_changed`; *label* prefixes the status line."""
+        if self._executor is None:
+            self.report(label, path, write_if_changed(path, content))
+            return
+        self._pending.append((label, path, self._executor.submit(write_if_changed, path, content)))
+        self._drain(wait_all=False)
+
+    def log(self, message: str) -> None:
+        """Prints *message* after the status lines of all writes queued before it."""
+        if self._pending:
+            self._pending.append((message, None, None))
+        else:
+            print(message)
+
+    def flush(self) -> None:
+        """Waits for every queued write and reports it. Raises the first write error in order."""
+        self._drain(wait_all=True)
+
+    def close(self) -> None:
+        """Cancels writes that have not started yet and stops the worker threads."""
+        for _, _, future in self._pending:
+            if future is not None:
+                future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'HeaderWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.close()
+
+    def _drain(self, wait_all: bool) -> None:
+        """Reports finished writes from the head of the queue, blocking when over the bound."""
+        while self._pending:
+            label, path, future = self._pending[0]
+            if future is None:
+                self._pending.popleft()
+                print(label)
+                continue
+            if not wait_all and len(self._pending) <= self._max_pending and not future.done():
+                break
+            self._pending.popleft()
+            self.report(label, path, future.result())
+
+    @staticmethod
+    def report(label: str, path: pathlib.Path, changed: bool) -> None:
+        """Prints the status line for one finished header write."""
+        status = "Written" if changed else "Unchanged"
+        print(f"{label}: **{status}** {path.name}")
+
+
 # --------------------------------------------------------------------
 # 4. Header Generation Logic (Two-Pass System)
 # --------------------------------------------------------------------
 
-def generate_header_content(block: UnicodeBlock, block_abbr: str, macro_generator: MacroGenerator) -> Tuple[Optional[List[str]], int, int]:
+def scan_block(block: UnicodeBlock, macro_generator: MacroGenerator) -> List[CodePointInfo]:
+    """
+    Stage 1: computes the character, category, name and glyph of every code
+    point in the block exactly once. Excluded categories are dropped here, so
+    later stages only see code points that can produce a #define.
+
+    This is the hot loop for the large ideograph blocks, so the lookups of
+    `resolve_char_name` and `printable_glyph` are inlined with local bindings.
     """
-    Generates the content lines (#define macros) for a single C header block using 
-    a robust two-pass system to handle all case-pairing orders.
+    category_of = macro_generator.ucd.category
+    name_of = macro_generator.ucd.name
+    control_names = macro_generator.CONTROL_CHARACTER_NAMES
+    records: List[CodePointInfo] = []
+    append = records.append
+    for cp in range(block.start, block.end + 1):
+        char = chr(cp)
+        cat = category_of(char)
+        if cat in EXCLUDE_CATEGORIES: continue
+        char_name = control_names.get(cp) or name_of(char, None) or f"{cat}_U{cp:04X}"
+        glyph = char if cat[0] not in "CZ" or char == " " else None
+        append(CodePointInfo(cp, char, cat, char_name, glyph))
+    return records
+
+def _code_point_info(cp: int, macro_generator: MacroGenerator) -> CodePointInfo:
+    """Builds the record of a single code point (used for case partners outside the block)."""
+    char = chr(cp)
+    cat = macro_generator.ucd.category(char)
+    return CodePointInfo(cp, char, cat, resolve_char_name(cp, char, cat, macro_generator), _glyph_for(char, cat))
+
+def build_block_entries(block: UnicodeBlock, block_abbr: str, macro_generator: MacroGenerator, records: Optional[List[CodePointInfo]] = None) -> List[MacroEntry]:
+    """
+    Resolves the macro entries for a single block using a robust two-pass
+    system to handle all case-pairing orders. Both passes work on the shared
+    records produced by `scan_block` (pass *records* to reuse an earlier scan).
     
-    The function uses the new `get_safe_macro_name` for global de-duplication.
+    The function uses `get_safe_macro_name` for global de-duplication, so blocks
+    must be processed in the same order for every run to get the same names.
     
-    Returns a tuple of (lines, defined_code_points, significant_hex_values).
+    Returns the list of MacroEntry records in code point order.
     """
-    
-    lines: List[str] = []
+    ucd = macro_generator.ucd
+    if records is None:
+        records = scan_block(block, macro_generator)
+    entries: List[MacroEntry] = []
     # Dict to store Ll -> Lu pairings: {Ll_CP: Lu_CP}
     case_pairs: Dict[int, int] = {} 
     # Set to track all CPs that belong to a pair (Ll and Lu)
     paired_cps: Set[int] = set() 
     
-    defined_code_points = 0
-    significant_hex_values = 0
-
-    # Categories to EXCLUDE (Unassigned, Private Use, Surrogate, Specific Separators)
-    EXCLUDE_CATEGORIES = {'Cn', 'Co', 'Cs', 'Zl', 'Zp'}
-    
     # =======================================================
     # PASS 1: IDENTIFY AND STORE ALL CASE PAIRS (Ll -> Lu)
     # =======================================================
-    for cp in range(block.start, block.end + 1):
-        try:
-            char = chr(cp)
-        except ValueError: continue
-            
-        cat = category(char)
-        if cat != 'Ll': continue # Only interested in Lowercase Letters here
-        
-        # 1. Resolve Name (must succeed for lookup in helper to work)
-        name1 = resolve_char_name(cp, char, cat, macro_generator)
+    for info in records:
+        if info.cat != 'Ll': continue # Only interested in Lowercase Letters here
         
-        # 2. Find partner using the name substitution strategy
-        partner_cp = find_case_partner(cp, name1) 
+        # Find partner using the name substitution strategy
+        partner_cp = find_case_partner(info.cp, info.name, ucd, info.cat) 
 
         if partner_cp is not None and partner_cp not in paired_cps:
             # Found a valid, unprocessed pair
-            case_pairs[cp] = partner_cp
-            paired_cps.add(cp)
+            case_pairs[info.cp] = partner_cp
+            paired_cps.add(info.cp)
             paired_cps.add(partner_cp)
+
+    by_cp: Dict[int, CodePointInfo] = {info.cp: info for info in records} if case_pairs else {}
             
     # =======================================================
     # PASS 2: GENERATE MACROS (Paired, then Single)
     # =======================================================
-    for cp in range(block.start, block.end + 1):
+    for info in records:
+        cp = info.cp
         if cp in case_pairs:
             # A. PAIR CASE (cp is the Ll char, acting as cp1)
-            cp1 = cp
             cp2 = case_pairs[cp]
-            
-            # --- Resolve names for the pair ---
-            char1 = chr(cp1)
-            char2 = chr(cp2)
-            cat1 = category(char1)
-            cat2 = category(char2)
-            
-            name1 = resolve_char_name(cp1, char1, cat1, macro_generator)
-            
-            glyph1, glyph2 = printable_glyph(cp1), printable_glyph(cp2)
+            partner = by_cp.get(cp2) or _code_point_info(cp2, macro_generator)
 
-            if glyph1 and glyph2:
-                comment = f"// {glyph1}/{glyph2}"
+            if info.glyph and partner.glyph:
+                comment = f"// {info.glyph}/{partner.glyph}"
             else:
-                name2 = resolve_char_name(cp2, char2, cat2, macro_generator)
-                comment_parts = [f"U+{cp1:04X} ({name1})", f"U+{cp2:04X} ({name2})"]
-                comment = f"/* {' '.join(comment_parts)} */"
+                comment = f"/* U+{cp:04X} ({info.name}) U+{cp2:04X} ({partner.name}) */"
             
             # Get the safe macro name (stripping case for pairs)
             macro_name = macro_generator.get_safe_macro_name(
-                block_abbr, name1, strip_case=True, char=char1, cp=cp1, cat=cat1
-            )
-            
-            lines.append(
-                f"#define {macro_name:<40} 0x{cp1:04X} 0x{cp2:04X}  {comment}" 
+                block_abbr, info.name, strip_case=True, char=info.char, cp=cp, cat=info.cat
             )
             
-            defined_code_points += 2
-            significant_hex_values += 2
+            entries.append(MacroEntry(macro_name, cp, cp2, comment))
             
         elif cp not in paired_cps:
             # B. SINGLE CODE POINT CASE (cp is not part of any pair)
-            
-            # 1. Skip excluded categories
-            try:
-                char = chr(cp)
-            except ValueError: continue
-            cat = category(char)
-            if cat in EXCLUDE_CATEGORIES: continue
-            
-            # 2. Resolve Name
-            char_name = resolve_char_name(cp, char, cat, macro_generator)
-            
-            if printable_glyph(cp):
-                comment = f"// {printable_glyph(cp)}"
+            if info.glyph:
+                comment = f"// {info.glyph}"
             else:
-                comment_parts = [f"U+{cp:04X} ({char_name})"]
-                comment = f"/* {' '.join(comment_parts)} */"
+                comment = f"/* U+{cp:04X} ({info.name}) */"
             
             # Get the safe macro name (not stripping case for singles)
             macro_name = macro_generator.get_safe_macro_name(
-                block_abbr, char_name, strip_case=False, char=char, cp=cp, cat=cat
+                block_abbr, info.name, strip_case=False, char=info.char, cp=cp, cat=info.cat
             )
 
-            lines.append(
-                f"#define {macro_name:<40} 0x{cp:04X} 0  {comment}" 
-            )
+            entries.append(MacroEntry(macro_name, cp, 0, comment))
             
-            defined_code_points += 1
-            significant_hex_values += 1 
-            
-    if not lines:
-        return None, 0, 0
-    
-    return lines, defined_code_points, significant_hex_values
+    return entries
 
-def emit_header(block: UnicodeBlock, out_dir: pathlib.Path, macro_generator: MacroGenerator) -> Optional[str]:
-    """
-    Writes one header file for the block, provides console feedback, and
-    returns the name of the file written, or None if skipped.
+def generate_header_content(block: UnicodeBlock, block_abbr: str, macro_generator: MacroGenerator) -> Tuple[Optional[List[str]], int, int]:
     """
+    Generates the content lines (#define macros) for a single C header block
+    from the entries resolved by `build_block_entries`.
     
-    # --- FILE NAMING LOGIC ---
-    s_clean = re.sub(r"[^\w]", "_", block.name)
-    file_basename = re.sub(r"_+", "_", s_clean).lower().strip("_")
-    header_filename = f"{file_basename}.h" # Capture filename
-    header_file = out_dir / header_filename
-    # -------------------------
-    
-    block_abbr = macro_generator.get_block_abbr(block.name)
+    Returns a tuple of (lines, defined_code_points, significant_hex_values).
+    """
+    entries = build_block_entries(block, block_abbr, macro_generator)
+    if not entries:
+        return None, 0, 0
+    return format_entry_lines(entries)
+
+def format_entry_lines(entries: List[MacroEntry]) -> Tuple[List[str], int, int]:
+    """
+    Formats MacroEntry records as #define lines.
     
-    content_lines, defined_code_points, significant_hex_values = generate_header_content(block, block_abbr, macro_generator)
+    Returns a tuple of (lines, defined_code_points, significant_hex_values).
+    """
+    lines = [
+        f"#define {e.macro_name:<40} 0x{e.cp1:04X} 0x{e.cp2:04X}  {e.comment}" if e.cp2
+        else f"#define {e.macro_name:<40} 0x{e.cp1:04X} 0  {e.comment}"
+        for e in entries
+    ]
+    defined_code_points = sum(2 if e.cp2 else 1 for e in entries)
+    significant_hex_values = sum(1 for e in entries) + sum(1 for e in entries if e.cp2)
     
-    # --- Consistency Check ---
-    consistency_message = ""
+    return lines, defined_code_points, significant_hex_values
+
+DEFAULT_CHUNK_SIZE = 0x1000
+
+def build_consistency_message(defined_code_points: int, significant_hex_values: int) -> str:
+    """Builds the consistency-check section of a header comment."""
     if defined_code_points != significant_hex_values:
-        consistency_message = (
+        return (
             f"\n* !! CONSISTENCY ERROR !!\n"
             f"* Code Points Defined: {defined_code_points}\n"
             f"* Significant Hex Values: {significant_hex_values}\n"
             f"* Description: Counts should be equal for a clean header.\n"
         )
-        print(f"ERROR: Block '{block.name}' consistency check failed! Code Points ({defined_code_points}) != Hex Values ({significant_hex_values})", file=sys.stderr)
-    else:
-        consistency_message = (
-            f"\n* Consistency Check:\n"
-            f"* Total Defined Code Points: {defined_code_points}\n"
-            f"* Total Significant Hex Values: {significant_hex_values}\n"
-            f"* Status: OK (Counts Match)\n"
-        )
-    # -------------------------
-    
-    if content_lines is None:
-        print(f"Processed block '{block.name}' (U+{block.start:04X}...U+{block.end:04X}): **Skipped** (no defines generated)")
-        return None
-        
-    # --- Collect Block Description and Links ---
-    additional_info_lines: List[str] = []
-    
-    # 1. Block Description
-    if block.description.strip():
-        additional_info_lines.append(" *")
-        additional_info_lines.append(" * Block Description:")
-        
-        # Format the description to fit within the C comment block
-        lines = block.description.strip().split('\n\n') # Split by double newline (paragraph)
-        
-        for line in lines:
-            current_line = []
-            max_width = 70 
-            
-            words = line.split()
-            for word in words:
-                # Sanitize line to prevent premature C comment termination
-                word = word.replace('*/', '* /') 
-                if not current_line or len(' '.join(current_line) + ' ' + word) > max_width:
-                    if current_line:
-                        additional_info_lines.append(f" * {' '.join(current_line)}")
-                    current_line = [word]
-                else:
-                    current_line.append(word)
-            if current_line:
-                additional_info_lines.append(f" * {' '.join(current_line)}")
-
-    # 2. Wikipedia URL
-    if block.wikipedia_url.strip():
-        additional_info_lines.append(" *")
-        additional_info_lines.append(f" * Wikipedia: {block.wikipedia_url.strip()}")
-
-    # 3. Unicode Charts URL
-    if block.unicode_charts_url.strip():
-        additional_info_lines.append(" *")
-        additional_info_lines.append(f" * Unicode Charts: {block.unicode_charts_url.strip()}")
-
-    # Join the lines for insertion into the boilerplate.
-    additional_info_block = "\n" + "\n".join(additional_info_lines) if additional_info_lines else ""
-    # -----------------------------------------------------------------
+    return (
+        f"\n* Consistency Check:\n"
+        f"* Total Defined Code Points: {defined_code_points}\n"
+        f"* Total Significant Hex Values: {significant_hex_values}\n"
+        f"* Status: OK (Counts Match)\n"
+    )
 
-    boilerplate = f"""\
-/* {header_file.name} – Unicode constants for U+{block.start:04X} … U+{block.end:04X}
+def render_header(header_name: str, start: int, end: int, body_lines: List[str], additional_info_block: str, consistency_message: str) -> str:
+    """Renders a complete header: license boilerplate, block info and the body lines."""
+    return f"""\
+/* {header_name} – Unicode constants for U+{start:04X} … U+{end:04X}
  *
  * This file was generated from Unidata 17.0.0 with the following license:
  *
@@ -670,17 +1081,938 @@ def emit_header(block: UnicodeBlock, out_dir: pathlib.Path, macro_generator: Mac
 
 #pragma once
 
-"""
+""" + "\n".join(body_lines) + "\n"
+
+def split_entries(entries: List[MacroEntry], start: int, end: int, chunk_size: int) -> List[Tuple[int, int, List[MacroEntry]]]:
+    """
+    Splits a block's entries into fixed code point ranges aligned to multiples
+    of *chunk_size*. Entries are grouped by their first code point, and empty
+    ranges are dropped.
+
+    Returns a list of (chunk_start, chunk_end, entries) tuples.
+    """
+    chunks: List[Tuple[int, int, List[MacroEntry]]] = []
+    chunk_start = start
+    index = 0
+    while chunk_start <= end:
+        chunk_end = min(end, (chunk_start // chunk_size + 1) * chunk_size - 1)
+        chunk_entries: List[MacroEntry] = []
+        while index < len(entries) and entries[index].cp1 <= chunk_end:
+            chunk_entries.append(entries[index])
+            index += 1
+        if chunk_entries:
+            chunks.append((chunk_start, chunk_end, chunk_entries))
+        chunk_start = chunk_end + 1
+    return chunks
+
+def _submit_header(writer: Optional[HeaderWriter], path: pathlib.Path, content: str, label: str) -> None:
+    """Queues the header on *writer*, or writes it synchronously if there is none."""
+    if writer is not None:
+        writer.submit(path, content, label)
+    else:
+        HeaderWriter.report(label, path, write_if_changed(path, content))
+
+def remove_stale_chunks(out_dir: pathlib.Path, file_basename: str, header_filename: str, keep: Set[str]) -> None:
+    """
+    Deletes the chunk headers of a block (<basename>_<hex>.h, marked as a chunk
+    of its header) that the current chunk options no longer produce.
+    """
+    prefix = f"{file_basename}_"
+    candidates = [n for n in os.listdir(out_dir) if n.startswith(prefix) and n not in keep]
+    if not candidates:
+        return
+    chunk_re = re.compile(re.escape(file_basename) + r"_[0-9a-f]{4,}\.h")
+    marker = f" * Chunk of {header_filename} ("
+    for name in candidates:
+        if not chunk_re.fullmatch(name):
+            continue
+        path = out_dir / name
+        try:
+            if marker in path.read_text(encoding="utf-8"):
+                path.unlink()
+                print(f"Removed stale chunk header: {path.name}")
+        except OSError as e:
+            print(f"Warning: Could not remove stale chunk header '{path}': {e}", file=sys.stderr)
+
+def header_basename(block_name: str) -> str:
+    """Returns the header file name (without .h) used for a Unicode block."""
+    s_clean = re.sub(r"[^\w]", "_", block_name)
+    return re.sub(r"_+", "_", s_clean).lower().strip("_")
+
+def emit_header(block: UnicodeBlock, out_dir: pathlib.Path, macro_generator: MacroGenerator, writer: Optional[HeaderWriter] = None,
+                chunk_threshold: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE, entries: Optional[List[MacroEntry]] = None) -> Optional[str]:
+    """
+    Writes one header file for the block, provides console feedback, and
+    returns the name of the file written, or None if skipped.
+
+    If a `writer` is given the file is queued on it instead of written
+    immediately; call `writer.flush()` before relying on the file.
+
+    If `chunk_threshold` is set and the header would be larger than that many
+    bytes, the defines are split into chunk headers of `chunk_size` code points
+    named after their first code point (e.g. cjk_unified_ideographs_extension_b_20000.h).
+    The block header is then an umbrella that includes all chunks, so callers
+    can include either the whole block or just the chunk they need.
+
+    Pass already resolved *entries* to skip `build_block_entries` (e.g. in
+    watch mode, where names were resolved before deciding to re-emit).
+    """
+    
+    # --- FILE NAMING LOGIC ---
+    file_basename = header_basename(block.name)
+    header_filename = f"{file_basename}.h" # Capture filename
+    header_file = out_dir / header_filename
+    # -------------------------
     
-    all_content = boilerplate + "\n".join(content_lines) + "\n"
-    header_file.write_text(all_content, encoding="utf-8")
+    block_abbr = macro_generator.get_block_abbr(block.name)
+    
+    if entries is None:
+        entries = build_block_entries(block, block_abbr, macro_generator)
+    content_lines, defined_code_points, significant_hex_values = format_entry_lines(entries)
+    
+    # --- Consistency Check ---
+    block_consistency = build_consistency_message(defined_code_points, significant_hex_values)
+    if defined_code_points != significant_hex_values:
+        print(f"ERROR: Block '{block.name}' consistency check failed! Code Points ({defined_code_points}) != Hex Values ({significant_hex_values})", file=sys.stderr)
+    # -------------------------
+    
+    if not entries:
+        message = f"Processed block '{block.name}' (U+{block.start:04X}...U+{block.end:04X}): **Skipped** (no defines generated)"
+        if writer is not None:
+            writer.log(message)
+        else:
+            print(message)
+        return None
+        
+    # --- Collect Block Description and Links ---
+    additional_info_lines: List[str] = []
     
-    print(f"Processed block '{block.name}' (U+{block.start:04X}...U+{block.end:04X}): **Written** to {header_file.name}")
+    # 1. Block Description
+    if block.description.strip():
+        additional_info_lines.append(" *")
+        additional_info_lines.append(" * Block Description:")
+        
+        # Format the description to fit within the C comment block
+        lines = block.description.strip().split('\n\n') # Split by double newline (paragraph)
+        
+        for line in lines:
+            current_line = []
+            max_width = 70 
+            
+            words = line.split()
+            for word in words:
+                # Sanitize line to prevent premature C comment termination
+                word = word.replace('*/', '* /') 
+                if not current_line or len(' '.join(current_line) + ' ' + word) > max_width:
+                    if current_line:
+                        additional_info_lines.append(f" * {' '.join(current_line)}")
+                    current_line = [word]
+                else:
+                    current_line.append(word)
+            if current_line:
+                additional_info_lines.append(f" * {' '.join(current_line)}")
+
+    # 2. Wikipedia URL
+    if block.wikipedia_url.strip():
+        additional_info_lines.append(" *")
+        additional_info_lines.append(f" * Wikipedia: {block.wikipedia_url.strip()}")
+
+    # 3. Unicode Charts URL
+    if block.unicode_charts_url.strip():
+        additional_info_lines.append(" *")
+        additional_info_lines.append(f" * Unicode Charts: {block.unicode_charts_url.strip()}")
+
+    # Join the lines for insertion into the boilerplate.
+    additional_info_block = "\n" + "\n".join(additional_info_lines) if additional_info_lines else ""
+    # -----------------------------------------------------------------
+
+    label = f"Processed block '{block.name}' (U+{block.start:04X}...U+{block.end:04X})"
+    all_content = render_header(header_file.name, block.start, block.end, content_lines, additional_info_block, block_consistency)
+
+    if chunk_threshold <= 0 or len(all_content.encode("utf-8")) <= chunk_threshold:
+        remove_stale_chunks(out_dir, file_basename, header_filename, set())
+        _submit_header(writer, header_file, all_content, label)
+        return header_filename
+
+    # --- Chunked output: one header per code point range plus an umbrella ---
+    include_lines: List[str] = []
+    chunk_names: Set[str] = set()
+    for chunk_start, chunk_end, chunk_entries in split_entries(entries, block.start, block.end, chunk_size):
+        chunk_file = out_dir / f"{file_basename}_{chunk_start:04x}.h"
+        chunk_lines, chunk_defined, chunk_significant = format_entry_lines(chunk_entries)
+        chunk_content = render_header(
+            chunk_file.name, chunk_start, chunk_end, chunk_lines,
+            f"\n *\n * Chunk of {header_filename} ({block.name}).",
+            build_consistency_message(chunk_defined, chunk_significant),
+        )
+        _submit_header(writer, chunk_file, chunk_content, f"{label} chunk U+{chunk_start:04X}...U+{chunk_end:04X}")
+        include_lines.append(f"#include \"{chunk_file.name}\"")
+        chunk_names.add(chunk_file.name)
+    remove_stale_chunks(out_dir, file_basename, header_filename, chunk_names)
+
+    umbrella_content = render_header(header_file.name, block.start, block.end, include_lines, additional_info_block, block_consistency)
+    _submit_header(writer, header_file, umbrella_content, label)
     return header_filename
 
 
+# --------------------------------------------------------------------
+# 5. Multi-Target Emitters
+# --------------------------------------------------------------------
+
+class Emitter(ABC):
+    """
+    Base class for additional output targets. Every emitter receives the same
+    MacroEntry records that the C headers are rendered from, so all targets
+    share one UCD scan and one collision resolution and always agree on names.
+
+    Subclasses set `filename`, collect the blocks in `add_block` and write the
+    output file once in `finish`.
+    """
+    filename = ""
+
+    def __init__(self, out_dir: pathlib.Path):
+        self.path = out_dir / self.filename
+
+    @abstractmethod
+    def add_block(self, block: UnicodeBlock, entries: List[MacroEntry]) -> None:
+        """Adds the entries of one block (called in block order)."""
+
+    @abstractmethod
+    def finish(self) -> bool:
+        """Writes the output file if its content changed. Returns True if it was written."""
+
+
+class TextEmitter(Emitter):
+    """
+    Emitter for source files that are a concatenation of per-block text.
+    Subclasses implement `format_block` (and optionally `header`/`footer`).
+    """
+
+    def __init__(self, out_dir: pathlib.Path):
+        super().__init__(out_dir)
+        self._parts: List[str] = []
+
+    def add_block(self, block: UnicodeBlock, entries: List[MacroEntry]) -> None:
+        if entries:
+            self._parts.append(self.format_block(block, entries))
+
+    @abstractmethod
+    def format_block(self, block: UnicodeBlock, entries: List[MacroEntry]) -> str:
+        """Returns the source text for the entries of one block."""
+
+    def header(self) -> str:
+        return ""
+
+    def footer(self) -> str:
+        return ""
+
+    def finish(self) -> bool:
+        return write_if_changed(self.path, self.header() + "".join(self._parts) + self.footer())
+
+
+class RustEmitter(TextEmitter):
+    """Rust `pub const` items: `[first, second]`, with second = 0 for single code points."""
+    filename = "unicode_keys.rs"
+
+    def header(self) -> str:
+        return (
+            f"//! Unicode constants generated by generate_unicode_headers.py\n"
+            f"//! Properties: Unicode {UNICODE_VERSION} / Blocks: Unicode {UNICODE_BLOCK_VERSION}\n"
+            f"#![allow(dead_code)]\n"
+        )
+
+    def format_block(self, block: UnicodeBlock, entries: List[MacroEntry]) -> str:
+        lines = [f"\n// {block.name} (U+{block.start:04X}...U+{block.end:04X})"]
+        lines.extend(f"pub const {e.macro_name}: [u32; 2] = [0x{e.cp1:04X}, 0x{e.cp2:04X}];" for e in entries)
+        return "\n".join(lines) + "\n"
+
+
+class PythonEmitter(TextEmitter):
+    """Python module constants: `(first, second)` tuples, with second = 0 for single code points."""
+    filename = "unicode_keys.py"
+
+    def header(self) -> str:
+        return (
+            f'"""Unicode constants generated by generate_unicode_headers.py\n\n'
+            f'Properties: Unicode {UNICODE_VERSION} / Blocks: Unicode {UNICODE_BLOCK_VERSION}\n"""\n'
+        )
+
+    def format_block(self, block: UnicodeBlock, entries: List[MacroEntry]) -> str:
+        lines = [f"\n# {block.name} (U+{block.start:04X}...U+{block.end:04X})"]
+        lines.extend(f"{e.macro_name} = (0x{e.cp1:04X}, 0x{e.cp2:04X})" for e in entries)
+        return "\n".join(lines) + "\n"
+
+
+class JsonEmitter(Emitter):
+    """One JSON object mapping block name -> {macro name: [first, second]}."""
+    filename = "unicode_keys.json"
+
+    def __init__(self, out_dir: pathlib.Path):
+        super().__init__(out_dir)
+        self._blocks: Dict[str, Dict[str, List[int]]] = {}
+
+    def add_block(self, block: UnicodeBlock, entries: List[MacroEntry]) -> None:
+        if entries:
+            self._blocks[block.name] = {e.macro_name: [e.cp1, e.cp2] for e in entries}
+
+    def finish(self) -> bool:
+        data = {
+            "unicode_version": UNICODE_VERSION,
+            "block_data_version": UNICODE_BLOCK_VERSION,
+            "blocks": self._blocks,
+        }
+        return write_if_changed(self.path, json.dumps(data, indent=1) + "\n")
+
+
+# C headers (which ZMK devicetree keymaps include through the C preprocessor)
+# are always written; these are the extra targets selectable with --emit.
+EMITTERS: Dict[str, type] = {
+    "rust": RustEmitter,
+    "python": PythonEmitter,
+    "json": JsonEmitter,
+}
+
+
+# --------------------------------------------------------------------
+# 6. Multi-Version Name Tables and Diff
+# --------------------------------------------------------------------
+
+# Block name -> {macro_name: (cp1, cp2)}, in block order
+NameTable = Dict[str, Dict[str, Tuple[int, int]]]
+
+# Format version of a name table saved with --dump-names
+NAME_TABLE_FORMAT = 1
+
+def build_name_table(macro_generator: MacroGenerator) -> NameTable:
+    """
+    Resolves every macro name for all blocks with the generator's UCD provider,
+    without rendering or writing any header.
+    """
+    table: NameTable = {}
+    for u_block in get_all_blocks(with_descriptions=False):
+        block_abbr = macro_generator.get_block_abbr(u_block.name)
+        entries = build_block_entries(u_block, block_abbr, macro_generator)
+        if entries:
+            table[u_block.name] = {e.macro_name: (e.cp1, e.cp2) for e in entries}
+    return table
+
+def build_version_tables(labels: List[str], config: Optional[Dict[str, Any]] = None) -> Dict[str, NameTable]:
+    """
+    Builds the name tables for several UCD providers in one process. The
+    abbreviation cache is shared, so names that are unchanged between versions
+    are only shortened once.
+    """
+    name_cache: Dict[Tuple[str, str, bool], str] = {}
+    tables: Dict[str, NameTable] = {}
+    for label in labels:
+        generator = MacroGenerator(UCD_SOURCES[label], name_cache=name_cache, warn=False, config=config)
+        tables[label] = build_name_table(generator)
+    return tables
+
+def save_name_table(path: pathlib.Path, table: NameTable, source: str, unicode_version: str) -> None:
+    """
+    Saves a name table as JSON, so it can be diffed against a later run (e.g.
+    after a unicodedata2 upgrade) with `--diff-versions FILE SOURCE`.
+    """
+    data = {
+        "format": NAME_TABLE_FORMAT,
+        "source": source,
+        "unicode_version": unicode_version,
+        "blocks": {block_name: {macro: list(cps) for macro, cps in names.items()} for block_name, names in table.items()},
+    }
+    write_if_changed(path, json.dumps(data, indent=1, ensure_ascii=False) + "\n")
+
+def load_name_table(path: str) -> Tuple[NameTable, str]:
+    """
+    Loads a name table saved by `save_name_table` and returns it with the
+    Unicode version it was built for. Raises ValueError for an unreadable file.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read name table '{path}': {e}")
+    if not isinstance(data, dict) or data.get("format") != NAME_TABLE_FORMAT or not isinstance(data.get("blocks"), dict):
+        raise ValueError(f"'{path}' is not a saved name table (format {NAME_TABLE_FORMAT})")
+    try:
+        table: NameTable = {
+            block_name: {macro: (int(cps[0]), int(cps[1])) for macro, cps in names.items()}
+            for block_name, names in data["blocks"].items()
+        }
+    except (AttributeError, TypeError, ValueError, IndexError) as e:
+        raise ValueError(f"Invalid entry in name table '{path}': {e}")
+    return table, str(data.get("unicode_version", "unknown"))
+
+def diff_name_tables(old: NameTable, new: NameTable) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+    """
+    Compares two name tables block by block. A code point that keeps its value
+    but changes its macro name is reported as 'renamed' rather than as an
+    add/remove pair; a name that now expands to different values is 'changed'.
+    Blocks without differences are omitted.
+    """
+    result: Dict[str, Dict[str, List[Dict[str, str]]]] = {}
+    block_names = list(old) + [b for b in new if b not in old]
+
+    for block_name in block_names:
+        old_names = old.get(block_name, {})
+        new_names = new.get(block_name, {})
+        old_by_cp = {cps[0]: macro for macro, cps in old_names.items()}
+        new_by_cp = {cps[0]: macro for macro, cps in new_names.items()}
+
+        renamed = []
+        renamed_old: Set[str] = set()
+        renamed_new: Set[str] = set()
+        for cp, old_macro in old_by_cp.items():
+            new_macro = new_by_cp.get(cp)
+            if new_macro is not None and new_macro != old_macro and old_macro not in new_names:
+                renamed.append({"code_point": f"U+{cp:04X}", "old": old_macro, "new": new_macro})
+                renamed_old.add(old_macro)
+                renamed_new.add(new_macro)
+
+        added = [
+            {"name": macro, "code_point": f"U+{cps[0]:04X}"}
+            for macro, cps in new_names.items()
+            if macro not in old_names and macro not in renamed_new
+        ]
+        removed = [
+            {"name": macro, "code_point": f"U+{cps[0]:04X}"}
+            for macro, cps in old_names.items()
+            if macro not in new_names and macro not in renamed_old
+        ]
+        changed = [
+            {"name": macro, "old": _format_cps(old_names[macro]), "new": _format_cps(cps)}
+            for macro, cps in new_names.items()
+            if macro in old_names and old_names[macro] != cps
+        ]
+
+        if added or removed or renamed or changed:
+            result[block_name] = {"added": added, "removed": removed, "renamed": renamed, "changed": changed}
+
+    return result
+
+def _format_cps(cps: Tuple[int, int]) -> str:
+    """Formats a (cp1, cp2) pair the way it appears in a #define line."""
+    return f"0x{cps[0]:04X} 0x{cps[1]:04X}" if cps[1] else f"0x{cps[0]:04X} 0"
+
+def run_version_diff(labels: List[str], output: Optional[str], config: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Builds name tables for the given UCD providers, or loads them from files
+    saved with --dump-names, and writes a JSON diff for every consecutive pair
+    of versions to `output` (or stdout).
+    """
+    if len(labels) < 2:
+        print("Error: --diff-versions needs at least two UCD sources or saved name tables.", file=sys.stderr)
+        return 1
+
+    load_block_data()
+    tables: Dict[str, NameTable] = {}
+    versions: Dict[str, str] = {}
+    for label in labels:
+        if label not in UCD_SOURCES:
+            try:
+                tables[label], versions[label] = load_name_table(label)
+            except ValueError as e:
+                print(f"Error: {e} (not one of the UCD sources {', '.join(sorted(UCD_SOURCES))} either)", file=sys.stderr)
+                return 1
+    ucd_labels = [label for label in dict.fromkeys(labels) if label in UCD_SOURCES]
+    tables.update(build_version_tables(ucd_labels, config))
+    versions.update((label, UCD_SOURCES[label].unidata_version) for label in ucd_labels)
+
+    diffs = []
+    for old_label, new_label in zip(labels, labels[1:]):
+        blocks = diff_name_tables(tables[old_label], tables[new_label])
+        diffs.append({
+            "from": {"source": old_label, "unicode_version": versions[old_label]},
+            "to": {"source": new_label, "unicode_version": versions[new_label]},
+            "summary": {kind: sum(len(b[kind]) for b in blocks.values()) for kind in ("added", "removed", "renamed", "changed")},
+            "blocks": blocks,
+        })
+
+    report = json.dumps({"block_data_version": UNICODE_BLOCK_VERSION, "diffs": diffs}, indent=4, ensure_ascii=False)
+    if output:
+        pathlib.Path(output).write_text(report + "\n", encoding="utf-8")
+        for diff in diffs:
+            print(f"{diff['from']['source']} -> {diff['to']['source']}: {diff['summary']}")
+    else:
+        print(report)
+    return 0
+
+def run_name_dump(output: str, config: Optional[Dict[str, Any]] = None) -> int:
+    """Builds the name table of the installed unicodedata2 and saves it to `output`."""
+    load_block_data()
+    table = build_version_tables(["unicodedata2"], config)["unicodedata2"]
+    save_name_table(pathlib.Path(output), table, "unicodedata2", UNICODE_VERSION)
+    print(f"Name table for unicodedata2 (Unicode {UNICODE_VERSION}, {sum(len(n) for n in table.values())} macros) saved to: {output}")
+    return 0
+
+
+# --------------------------------------------------------------------
+# 7. Watch Mode
+# --------------------------------------------------------------------
+
+WatchBlockState = namedtuple('WatchBlockState', ['inputs_key', 'entries', 'claimed', 'probed', 'names_blob', 'words', 'tokens'])
+
+class WatchSession:
+    """
+    Keeps the generation state warm between runs for --watch mode: the
+    per-block code point records (the UCD scan) and, for every block, the
+    entries, the macro names it claimed and the names it probed for
+    collisions in the last run.
+
+    On a change a block is only re-resolved if its own inputs changed, the
+    abbreviation rule diff touches one of its names, or an earlier block's
+    claimed names changed in a way that affects a name it probed. Every other
+    block reuses its previous entries, and a header is only re-rendered and
+    written when its entries or block info actually changed.
+    """
+
+    def __init__(self, blocks_dir: pathlib.Path, abbreviations_file: Optional[str], write_jobs: int,
+                 chunk_threshold: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.blocks_dir = blocks_dir
+        self.keys_dir = blocks_dir.parent
+        self.abbreviations_file = abbreviations_file
+        self.write_jobs = write_jobs
+        self.chunk_threshold = chunk_threshold
+        self.chunk_size = chunk_size
+        self._records: Dict[Tuple[str, int, int], List[CodePointInfo]] = {}
+        self._states: Dict[str, WatchBlockState] = {}
+        self._block_order: List[str] = []
+        self._engine: Optional[AbbreviationEngine] = None
+        self._mtimes: Dict[str, Optional[int]] = {}
+
+    def watched_files(self) -> List[str]:
+        """Returns the input files whose edits trigger a regeneration."""
+        files = [BLOCKS_DATA_FILE, BLOCK_DESCRIPTIONS_FILE]
+        if self.abbreviations_file:
+            files.append(self.abbreviations_file)
+        return files
+
+    def poll_changes(self) -> List[str]:
+        """Returns the watched files whose modification time changed since the last poll."""
+        changed = []
+        for path in self.watched_files():
+            try:
+                mtime: Optional[int] = pathlib.Path(path).stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if self._mtimes.get(path, -1) != mtime:
+                self._mtimes[path] = mtime
+                changed.append(path)
+        return changed
+
+    def regenerate(self) -> Tuple[int, int]:
+        """
+        Reloads the inputs, re-resolves the affected blocks and re-emits the
+        ones whose output changed. Returns (blocks re-resolved, headers re-emitted).
+        """
+        reset_block_data()
+        load_block_data()
+        config = load_abbreviation_config(self.abbreviations_file) if self.abbreviations_file else {}
+        generator = MacroGenerator(config=config, warn=False)
+        blocks = list(get_all_blocks())
+
+        # Collision resolution depends on block order; start over if it changed
+        block_order = [b.name for b in blocks]
+        if block_order != self._block_order:
+            self._states.clear()
+            self._block_order = block_order
+
+        # Replacement keys are matched against the raw names, redundant words
+        # against the replaced tokens and case words against the raw words
+        replacement_re: Optional['re.Pattern[str]'] = None
+        redundant_words: Set[str] = set()
+        case_words: Set[str] = set()
+        if self._engine is not None:
+            replacement_keys, redundant_words, case_words = generator.engine.changed_rules(self._engine)
+            if replacement_keys:
+                replacement_re = re.compile("|".join(re.escape(k) for k in sorted(replacement_keys, key=len, reverse=True)))
+        self._engine = generator.engine
+
+        generated_files: List[str] = []
+        changed_names: Set[str] = set()
+        resolved = emitted = 0
+        with HeaderWriter(max_workers=self.write_jobs) as writer:
+            for u_block in blocks:
+                key = (u_block.name, u_block.start, u_block.end)
+                if key not in self._records:
+                    self._records[key] = scan_block(u_block, generator)
+                records = self._records[key]
+
+                block_abbr = generator.get_block_abbr(u_block.name)
+                inputs_key = (UNICODE_BLOCK_VERSION, u_block, block_abbr)
+                previous = self._states.get(u_block.name)
+
+                dirty = (
+                    previous is None
+                    or previous.inputs_key != inputs_key
+                    or (replacement_re is not None and replacement_re.search(previous.names_blob) is not None)
+                    or not previous.tokens.isdisjoint(redundant_words)
+                    or not previous.words.isdisjoint(case_words)
+                    or not previous.probed.isdisjoint(changed_names)
+                )
+                if not dirty:
+                    generator.reserve_names(previous.claimed)
+                    if previous.entries:
+                        generated_files.append(f"{header_basename(u_block.name)}.h")
+                    continue
+
+                generator.probe_log = set()
+                entries = build_block_entries(u_block, block_abbr, generator, records)
+                claimed = frozenset(e.macro_name for e in entries)
+                names_blob = "\n".join(r.name for r in records).upper()
+                words = frozenset(names_blob.split())
+                # Only watch mode needs the tokens before redundant-word removal
+                replaced_tokens = generator.engine.replaced_tokens
+                state = WatchBlockState(
+                    inputs_key, entries, claimed, frozenset(generator.probe_log),
+                    names_blob, words, frozenset(t for w in words for t in replaced_tokens(w)),
+                )
+                generator.probe_log = None
+                resolved += 1
+                changed_names |= (claimed ^ previous.claimed) if previous else claimed
+                self._states[u_block.name] = state
+
+                if previous is not None and previous.inputs_key == inputs_key and previous.entries == entries:
+                    if entries:
+                        generated_files.append(f"{header_basename(u_block.name)}.h")
+                    continue
+
+                filename = emit_header(u_block, self.blocks_dir, generator, writer,
+                                       self.chunk_threshold, self.chunk_size, entries=entries)
+                emitted += 1
+                if filename:
+                    generated_files.append(filename)
+
+        # Forget the records of blocks that were removed or had their range changed
+        live_keys = {(b.name, b.start, b.end) for b in blocks}
+        for key in set(self._records) - live_keys:
+            del self._records[key]
+
+        generate_keys_header(self.keys_dir, generated_files)
+        remove_stale_precompiled_headers(self.keys_dir)
+        return resolved, emitted
+
+def run_watch(session: WatchSession, interval: float) -> int:
+    """
+    Generates all headers once, then polls the watched files and regenerates
+    the affected blocks after every change until interrupted with Ctrl-C.
+    """
+    session.poll_changes()
+    started = time.perf_counter()
+    try:
+        session.regenerate()
+        print(f"\nInitial generation took {time.perf_counter() - started:.2f} s.")
+    except SystemExit:
+        print("Initial generation failed, waiting for the next change...", file=sys.stderr)
+    except OSError as e:
+        print(f"Error writing header file: {e}", file=sys.stderr)
+    print(f"Watching {', '.join(session.watched_files())} for changes (Ctrl-C to stop)...")
+
+    try:
+        while True:
+            time.sleep(interval)
+            changed = session.poll_changes()
+            if not changed:
+                continue
+
+            started = time.perf_counter()
+            try:
+                resolved, emitted = session.regenerate()
+            except SystemExit:
+                # Loaders exit on invalid input; keep watching until the file is fixed.
+                print("Regeneration failed, waiting for the next change...", file=sys.stderr)
+                continue
+            except OSError as e:
+                print(f"Error writing header file: {e}", file=sys.stderr)
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"Change in {', '.join(changed)}: re-resolved {resolved} block(s), re-emitted {emitted} header(s) in {elapsed_ms:.0f} ms.")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return 0
+
+
+# --------------------------------------------------------------------
+# 8. Precompiled keys.h
+# --------------------------------------------------------------------
+
+# PCH files written next to keys.h by GCC and Clang (see build_precompiled_header)
+PCH_FILENAMES = ("keys.h.gch", "keys.h.pch")
+
+def _compiler_identity(compiler: str) -> Tuple[str, str]:
+    """Returns (kind, version text) for a compiler, where kind is 'clang' or 'gcc'."""
+    import subprocess
+    result = subprocess.run([compiler, "--version"], capture_output=True, text=True, check=True)
+    version_text = result.stdout.strip()
+    return ("clang" if "clang" in version_text.lower() else "gcc"), version_text
+
+def _header_tree_digest(keys_dir: pathlib.Path) -> str:
+    """Hashes keys.h and every block header below keys_dir, in a stable order."""
+    import hashlib
+    digest = hashlib.sha256()
+    for path in [keys_dir / "keys.h"] + sorted((keys_dir / "blocks").glob("*.h")):
+        digest.update(path.name.encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def _remove_precompiled_header(pch: pathlib.Path) -> None:
+    """Deletes a precompiled header and its stamp, if present."""
+    for path in (pch, pch.with_name(pch.name + ".stamp")):
+        try:
+            if path.exists():
+                path.unlink()
+                print(f"Removed stale precompiled header: {path}")
+        except OSError as e:
+            print(f"Warning: Could not remove stale precompiled header '{path}': {e}", file=sys.stderr)
+
+def remove_stale_precompiled_headers(keys_dir: pathlib.Path, keep: Optional[pathlib.Path] = None) -> None:
+    """
+    Deletes keys.h.gch / keys.h.pch next to keys.h (except *keep*) unless
+    their stamp records the current header tree. GCC uses a keys.h.gch for
+    `#include "keys.h"` without checking it against the header, so a PCH
+    left over from older headers would silently shadow the new ones.
+    """
+    digest: Optional[str] = None
+    for name in PCH_FILENAMES:
+        pch = keys_dir / name
+        if pch == keep or not pch.exists():
+            continue
+        try:
+            stamp = pch.with_name(pch.name + ".stamp").read_text(encoding="utf-8")
+            if digest is None:
+                digest = _header_tree_digest(keys_dir)
+        except OSError:
+            stamp = ""
+        if digest is None or f"headers_sha256: {digest}\n" not in stamp:
+            _remove_precompiled_header(pch)
+
+def build_precompiled_header(keys_dir: pathlib.Path, compiler: str, flags: List[str]) -> Optional[pathlib.Path]:
+    """
+    Precompiles keys.h for the local GCC or Clang toolchain.
+
+    GCC picks up keys.h.gch automatically for `#include "keys.h"`; Clang
+    needs `-include-pch keys.h.pch`. A PCH is only valid for the exact
+    compiler and flags it was built with, so both are part of the stamp
+    (keys.h.gch.stamp / keys.h.pch.stamp) next to it, together with a hash
+    of all headers. The PCH is only rebuilt when that stamp changes.
+
+    Returns the PCH path, or None if it could not be built (a previous PCH
+    at that path is then deleted).
+    """
+    import hashlib
+    import shlex
+    import subprocess
+
+    try:
+        kind, version_text = _compiler_identity(compiler)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: Cannot run compiler '{compiler}': {e}", file=sys.stderr)
+        return None
+
+    header = keys_dir / "keys.h"
+    pch = keys_dir / ("keys.h.pch" if kind == "clang" else "keys.h.gch")
+    stamp_path = pch.with_name(pch.name + ".stamp")
+    stamp_content = "\n".join([
+        f"compiler: {compiler}",
+        f"compiler_version_sha256: {hashlib.sha256(version_text.encode('utf-8')).hexdigest()}",
+        f"flags: {shlex.join(flags)}",
+        f"headers_sha256: {_header_tree_digest(keys_dir)}",
+    ]) + "\n"
+
+    try:
+        if pch.exists() and stamp_path.read_text(encoding="utf-8") == stamp_content:
+            print(f"Precompiled header is up to date: {pch}")
+            return pch
+    except OSError:
+        pass
+
+    command = [compiler, *flags, "-x", "c-header", str(header), "-o", str(pch)]
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Error: Precompiling keys.h failed ({shlex.join(command)}):\n{result.stderr}", file=sys.stderr)
+        _remove_precompiled_header(pch)
+        return None
+
+    write_if_changed(stamp_path, stamp_content)
+    print(f"Precompiled header written: {pch} ({time.perf_counter() - started:.2f} s)")
+    return pch
+
+def benchmark_precompiled_header(keys_dir: pathlib.Path, compiler: str, flags: List[str], pch: pathlib.Path, runs: int = 5) -> None:
+    """
+    Compiles a translation unit that includes keys.h `runs` times with plain
+    includes and with the PCH, and prints the best and median time of each.
+
+    The plain build includes keys.h through a symlinked copy of the tree, so
+    GCC cannot silently pick up the .gch that sits next to the real keys.h.
+    """
+    import subprocess
+    import tempfile
+
+    kind, _ = _compiler_identity(compiler)
+
+    with tempfile.TemporaryDirectory(prefix="keys_pch_bench_") as tmp:
+        tmp_dir = pathlib.Path(tmp)
+        plain_dir = tmp_dir / "plain"
+        plain_dir.mkdir()
+        (plain_dir / "keys.h").symlink_to((keys_dir / "keys.h").resolve())
+        (plain_dir / "blocks").symlink_to((keys_dir / "blocks").resolve(), target_is_directory=True)
+        source = tmp_dir / "tu.c"
+        source.write_text('#include "keys.h"\nint main(void) { return 0; }\n', encoding="utf-8")
+        output = tmp_dir / "tu.o"
+
+        base = [compiler, *flags, "-c", str(source), "-o", str(output)]
+        variants = {
+            "plain": base + ["-I", str(plain_dir)],
+            "pch": base + ["-I", str(keys_dir)] + (["-include-pch", str(pch)] if kind == "clang" else ["-Winvalid-pch"]),
+        }
+
+        timings: Dict[str, List[float]] = {}
+        for label, command in variants.items():
+            samples = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                subprocess.run(command, check=True, capture_output=True)
+                samples.append(time.perf_counter() - started)
+            timings[label] = sorted(samples)
+
+    print(f"\nPer-TU compile time for '#include \"keys.h\"' ({compiler}, {runs} runs):")
+    for label, samples in timings.items():
+        print(f" - {label:<5}: best {samples[0] * 1000:8.1f} ms, median {samples[runs // 2] * 1000:8.1f} ms")
+    median = runs // 2
+    saved = timings["plain"][median] - timings["pch"][median]
+    print(f" - Saving per TU (median): {saved * 1000:.1f} ms ({saved / timings['plain'][median]:.0%})")
+
+
+# --------------------------------------------------------------------
+# 9. Sharded Generation
+# --------------------------------------------------------------------
+
+SHARD_FORMAT_VERSION = 1
+# Default directory of the --shard partial outputs (kept out of the header tree)
+DEFAULT_SHARD_DIR = "shards"
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """Parses a 1-based 'i/N' shard spec (argparse type for --shard)."""
+    try:
+        index_text, count_text = spec.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got '{spec}'")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"expected 1 <= i <= N, got '{spec}'")
+    return index, count
+
+def shard_blocks(index: int, count: int) -> List[UnicodeBlock]:
+    """
+    Returns the blocks of shard `index` of `count`: every count-th block in
+    block order, so the large neighbouring ideograph blocks end up on
+    different shards. The split only depends on the block data.
+    """
+    return [u_block for position, u_block in enumerate(get_all_blocks(with_descriptions=False)) if position % count == index - 1]
+
+def run_shard(index: int, count: int, output_path: pathlib.Path, abbreviations_file: Optional[str], config: Optional[Dict[str, Any]]) -> int:
+    """
+    Resolves the blocks of one shard and writes them to a partial output file
+    for `--merge-shards` instead of writing headers.
+
+    Per block the file holds one row per macro: [cp1, cp2, tentative name,
+    comment], plus the full unshortened name as a fifth element for rows
+    whose tentative name already collided within the shard. Names are only
+    final once the merge re-claims them in global block order.
+    """
+    generator = MacroGenerator(warn=False, config=config)
+    candidates: Dict[int, Tuple[str, Optional[str]]] = {}
+    generator.candidate_log = candidates
+
+    blocks: Dict[str, List[list]] = {}
+    for u_block in shard_blocks(index, count):
+        candidates.clear()
+        entries = build_block_entries(u_block, generator.get_block_abbr(u_block.name), generator)
+        rows = []
+        for entry in entries:
+            tentative_name, full_name = candidates[entry.cp1]
+            row = [entry.cp1, entry.cp2, tentative_name, entry.comment]
+            if full_name is not None:
+                row.append(full_name)
+            rows.append(row)
+        blocks[u_block.name] = rows
+
+    manifest = {
+        "format": SHARD_FORMAT_VERSION,
+        "shard": [index, count],
+        "inputs": build_stamp_content(abbreviations_file),
+        "blocks": blocks,
+    }
+    try:
+        output_path.parent.mkdir(exist_ok=True, parents=True)
+        changed = write_if_changed(output_path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")) + "\n")
+    except OSError as e:
+        print(f"Error writing shard file '{output_path}': {e}", file=sys.stderr)
+        return 1
+    total = sum(len(rows) for rows in blocks.values())
+    print(f"Shard {index}/{count}: {len(blocks)} blocks, {total} macros, {'written' if changed else 'unchanged'}: {output_path}")
+    return 0
+
+def load_shard_manifests(paths: List[str], abbreviations_file: Optional[str]) -> Dict[str, List[list]]:
+    """
+    Loads the partial outputs of `run_shard` and returns their rows by block name.
+
+    Raises ValueError if a file was produced from different inputs (script,
+    block data, unicodedata2 or abbreviation config), if the files disagree
+    on the shard count, or if the blocks are not covered exactly once.
+    """
+    expected_inputs = build_stamp_content(abbreviations_file)
+    rows_by_block: Dict[str, List[list]] = {}
+    shard_count: Optional[int] = None
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cannot read shard file '{path}': {e}")
+        if (not isinstance(manifest, dict) or manifest.get("format") != SHARD_FORMAT_VERSION
+                or not isinstance(manifest.get("blocks"), dict)
+                or not isinstance(manifest.get("shard"), list) or len(manifest["shard"]) != 2):
+            raise ValueError(f"'{path}' is not a shard file (format {SHARD_FORMAT_VERSION})")
+        if manifest.get("inputs") != expected_inputs:
+            raise ValueError(f"Shard file '{path}' was generated from different inputs; regenerate all shards")
+        index, count = manifest["shard"]
+        if shard_count is None:
+            shard_count = count
+        elif count != shard_count:
+            raise ValueError(f"Shard file '{path}' is shard {index}/{count}, expected N={shard_count}")
+        for block_name, rows in manifest["blocks"].items():
+            if block_name in rows_by_block:
+                raise ValueError(f"Block '{block_name}' appears in more than one shard file")
+            rows_by_block[block_name] = rows
+
+    missing = [u_block.name for u_block in get_all_blocks(with_descriptions=False) if u_block.name not in rows_by_block]
+    if missing:
+        raise ValueError(f"{len(missing)} blocks are missing from the shard files (first: '{missing[0]}')")
+    return rows_by_block
+
+def merge_shard_entries(rows: List[list], macro_generator: MacroGenerator) -> List[MacroEntry]:
+    """
+    Claims the final names of one block from its shard rows. Blocks must be
+    merged in block order, which gives the same names as a serial run. Full
+    names the shard did not record are built here, for the few rows that only
+    collide with a block of another shard.
+    """
+    ucd = macro_generator.ucd
+    entries: List[MacroEntry] = []
+    for row in rows:
+        cp1, cp2, tentative_name, comment = row[:4]
+        if len(row) > 4:
+            full_name_of = lambda full_name=row[4]: full_name
+        else:
+            full_name_of = lambda cp=cp1: macro_generator.get_full_unshortened_name(cp, chr(cp), ucd.category(chr(cp)))
+        entries.append(MacroEntry(macro_generator.claim_macro_name(tentative_name, cp1, full_name_of), cp1, cp2, comment))
+    return entries
+
+
 # --------------------------------------------------------------------\
-# 5. Main Execution
+# 10. Main Execution
 # --------------------------------------------------------------------\
 
 def generate_keys_header(keys_dir: pathlib.Path, generated_filenames: List[str]) -> None:
@@ -713,15 +2045,89 @@ def generate_keys_header(keys_dir: pathlib.Path, generated_filenames: List[str])
 """
     
     all_content = boilerplate + "\n".join(include_lines) + "\n"
-    keys_header_path.write_text(all_content, encoding="utf-8")
-    print(f"\nMaster header written: {keys_header_path.name}")
+    status = "written" if write_if_changed(keys_header_path, all_content) else "unchanged"
+    print(f"\nMaster header {status}: {keys_header_path.name}")
     print(f"It includes {len(generated_filenames)} block headers generated in this run.")
 
 
+def _unicodedata2_version() -> str:
+    """Returns the installed unicodedata2 package version (falls back to its UCD version)."""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        return version("unicodedata2")
+    except (ImportError, PackageNotFoundError):
+        return UNICODE_VERSION
+
+def _sha256_file(path: pathlib.Path) -> str:
+    """Returns the hex SHA-256 of a file's bytes."""
+    import hashlib
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def get_generator_inputs(abbreviations_file: Optional[str] = None, registry_file: Optional[str] = None) -> List[pathlib.Path]:
+    """
+    Returns the real file inputs of a header generation run: the block range
+    index and description store, this script, the unicodedata2 extension
+    module and, if used, the abbreviation config and the name registry.
+    """
+    inputs = [
+        pathlib.Path(BLOCKS_DATA_FILE),
+        pathlib.Path(__file__).resolve(),
+        pathlib.Path(unicodedata2.__file__).resolve(),
+    ]
+    if pathlib.Path(BLOCK_DESCRIPTIONS_FILE).exists():
+        inputs.append(pathlib.Path(BLOCK_DESCRIPTIONS_FILE))
+    if abbreviations_file:
+        inputs.append(pathlib.Path(abbreviations_file))
+    if registry_file and pathlib.Path(registry_file).exists():
+        inputs.append(pathlib.Path(registry_file))
+    return inputs
+
+def build_stamp_content(abbreviations_file: Optional[str] = None, options: Optional[Dict[str, str]] = None,
+                        registry_file: Optional[str] = None) -> str:
+    """
+    Builds the stamp file text. It changes whenever the block data, the script,
+    the abbreviation config, the name registry, the unicodedata2 version or one
+    of the output *options* (e.g. the --emit targets) changes, and is stable
+    otherwise.
+    """
+    stamp_lines = [
+        f"block_data_sha256: {_sha256_file(pathlib.Path(BLOCKS_DATA_FILE))}",
+        f"generator_sha256: {_sha256_file(pathlib.Path(__file__).resolve())}",
+        f"unicodedata2_version: {_unicodedata2_version()}",
+        f"unicode_version: {UNICODE_VERSION}",
+    ]
+    if pathlib.Path(BLOCK_DESCRIPTIONS_FILE).exists():
+        stamp_lines.append(f"block_descriptions_sha256: {_sha256_file(pathlib.Path(BLOCK_DESCRIPTIONS_FILE))}")
+    if abbreviations_file:
+        stamp_lines.append(f"abbreviations_sha256: {_sha256_file(pathlib.Path(abbreviations_file))}")
+    if registry_file:
+        registry_path = pathlib.Path(registry_file)
+        stamp_lines.append(f"registry_sha256: {_sha256_file(registry_path) if registry_path.exists() else 'missing'}")
+    for option, value in sorted((options or {}).items()):
+        stamp_lines.append(f"option_{option}: {value}")
+    return "\n".join(stamp_lines) + "\n"
+
+def _escape_make_path(path: pathlib.Path) -> str:
+    """Escapes a path for use in a Make/Ninja depfile."""
+    return str(path).replace("\\", "/").replace(" ", "\\ ").replace("#", "\\#").replace("$", "$$")
+
+def write_depfile(depfile_path: pathlib.Path, target: pathlib.Path, abbreviations_file: Optional[str] = None,
+                  registry_file: Optional[str] = None) -> None:
+    """
+    Writes a Make/Ninja compatible depfile declaring that *target* depends on
+    every file returned by `get_generator_inputs`.
+    """
+    deps = " \\\n  ".join(_escape_make_path(p) for p in get_generator_inputs(abbreviations_file, registry_file))
+    write_if_changed(depfile_path, f"{_escape_make_path(target)}: \\\n  {deps}\n")
+
+
 def main() -> int:
     """
     Main execution function.
     """
+    import shlex
+
+    global BLOCK_DESCRIPTIONS_FILE
     parser = argparse.ArgumentParser(
         description="Generate C header files containing Unicode code point definitions."
     )
@@ -733,7 +2139,159 @@ def main() -> int:
         default=str(DEFAULT_OUTPUT_DIR),
         help=f'Specify the output directory for the generated headers (default: {DEFAULT_OUTPUT_DIR})'
     )
+    parser.add_argument(
+        '-a', '--abbreviations',
+        type=str,
+        default=None,
+        help='JSON file with extra abbreviation rules (block_abbreviations, replacements, redundant_words, case_words)'
+    )
+    parser.add_argument(
+        '--descriptions',
+        type=str,
+        default=BLOCK_DESCRIPTIONS_FILE,
+        help=f'Block description store written by generate_blocks_data.py -d (default: {BLOCK_DESCRIPTIONS_FILE})'
+    )
+    parser.add_argument(
+        '-j', '--write-jobs',
+        type=int,
+        default=4,
+        help='Number of background threads writing header files (0 writes synchronously; default: 4)'
+    )
+    parser.add_argument(
+        '--chunk-threshold',
+        type=int,
+        default=0,
+        help='Split block headers larger than this many bytes into chunk headers plus an umbrella header (default: 0, never split)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=lambda v: int(v, 0),
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Code points per chunk header, aligned to multiples of this value (default: {DEFAULT_CHUNK_SIZE:#x})'
+    )
+    parser.add_argument(
+        '--emit',
+        nargs='+',
+        choices=sorted(EMITTERS),
+        metavar='TARGET',
+        help=f'Also write the same names for these targets ({", ".join(sorted(EMITTERS))}) from the same pass'
+    )
+    parser.add_argument(
+        '--emit-dir',
+        type=str,
+        default=None,
+        help='Directory for the --emit outputs (default: the keys.h directory)'
+    )
+    parser.add_argument(
+        '--pch',
+        metavar='COMPILER',
+        default=None,
+        help='Also precompile keys.h with this local GCC/Clang (e.g. gcc); only valid for TUs built with the same compiler and --pch-flags'
+    )
+    parser.add_argument(
+        '--pch-flags',
+        type=str,
+        default='',
+        help='Compiler flags used for the precompiled header, as one quoted string (e.g. --pch-flags="-std=c11 -O2")'
+    )
+    parser.add_argument(
+        '--pch-benchmark',
+        type=int,
+        default=0,
+        metavar='RUNS',
+        help='Compare per-TU compile time with and without the precompiled header over RUNS compilations'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running, watching the block data and abbreviation config, and regenerate affected headers on change'
+    )
+    parser.add_argument(
+        '--watch-interval',
+        type=float,
+        default=0.25,
+        help='Seconds between file checks in --watch mode (default: 0.25)'
+    )
+    parser.add_argument(
+        '--depfile',
+        type=str,
+        default=None,
+        help='Write a Make/Ninja depfile listing the generator inputs (target: the --stamp file, or keys.h)'
+    )
+    parser.add_argument(
+        '--stamp',
+        type=str,
+        default=None,
+        help='Stamp file recording the input hashes; generation is skipped if it is up to date'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate even if the --stamp file is up to date'
+    )
+    parser.add_argument(
+        '--registry',
+        type=str,
+        default=None,
+        help='Macro name registry (JSON, code point -> name): reuse the names it records and add the new ones; delete it to reassign all names'
+    )
+    parser.add_argument(
+        '--shard',
+        type=parse_shard_spec,
+        default=None,
+        metavar='i/N',
+        help='Only resolve shard i of N (1-based) of the blocks and write a partial output file instead of headers'
+    )
+    parser.add_argument(
+        '--shard-output',
+        type=str,
+        default=None,
+        help=f'Partial output file for --shard (default: {DEFAULT_SHARD_DIR}/shard_<i>_of_<N>.json)'
+    )
+    parser.add_argument(
+        '--merge-shards',
+        nargs='+',
+        default=None,
+        metavar='FILE',
+        help='Build the headers and keys.h from the --shard partial outputs, resolving name collisions across all blocks'
+    )
+    parser.add_argument(
+        '--diff-versions',
+        nargs='+',
+        metavar='SOURCE',
+        help=f'Build macro names for two or more UCD sources ({", ".join(sorted(UCD_SOURCES))}) or name tables saved with --dump-names, and print a JSON diff by block instead of writing headers'
+    )
+    parser.add_argument(
+        '--dump-names',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Save the macro name table of the installed unicodedata2 to FILE instead of writing headers (diff it after an upgrade with --diff-versions FILE unicodedata2)'
+    )
+    parser.add_argument(
+        '--diff-output',
+        type=str,
+        default=None,
+        help='Write the --diff-versions report to this file instead of stdout'
+    )
     args = parser.parse_args()
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if sum(bool(mode) for mode in (args.shard, args.merge_shards, args.watch)) > 1:
+        parser.error("--shard, --merge-shards and --watch cannot be combined")
+    if args.registry and (args.shard or args.watch):
+        parser.error("--registry applies to full and --merge-shards runs, not to --shard or --watch")
+    if args.watch and (args.emit or args.stamp or args.depfile or args.pch):
+        parser.error("--emit, --stamp, --depfile and --pch are not supported with --watch")
+
+    # Read by load_block_descriptions, the watch loop and the stamp/depfile inputs
+    BLOCK_DESCRIPTIONS_FILE = args.descriptions
+    config = load_abbreviation_config(args.abbreviations) if args.abbreviations else None
+
+    if args.diff_versions:
+        return run_version_diff(args.diff_versions, args.diff_output, config)
+    if args.dump_names:
+        return run_name_dump(args.dump_names, config)
     
     # blocks_dir is the path to the 'blocks' directory
     blocks_dir = pathlib.Path(args.output)
@@ -746,6 +2304,44 @@ def main() -> int:
     
     # Pre-check: attempt to load data early
     load_block_data() 
+
+    if args.shard:
+        index, count = args.shard
+        shard_output = pathlib.Path(args.shard_output or pathlib.Path(DEFAULT_SHARD_DIR) / f"shard_{index}_of_{count}.json")
+        return run_shard(index, count, shard_output, args.abbreviations, config)
+
+    shard_rows: Optional[Dict[str, List[list]]] = None
+    if args.merge_shards:
+        try:
+            shard_rows = load_shard_manifests(args.merge_shards, args.abbreviations)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    # Build-system integration: skip the run entirely if nothing changed
+    stamp_path = pathlib.Path(args.stamp) if args.stamp else None
+    depfile_target = stamp_path or keys_dir / "keys.h"
+    emit_dir = pathlib.Path(args.emit_dir) if args.emit_dir else keys_dir
+    emit_targets = list(dict.fromkeys(args.emit or []))
+    stamp_options = {
+        "emit": ",".join(sorted(emit_targets)),
+        "emit_dir": str(emit_dir.resolve()) if emit_targets else "",
+        "chunk_threshold": str(args.chunk_threshold),
+        "chunk_size": str(args.chunk_size) if args.chunk_threshold > 0 else "",
+    }
+    stamp_content = build_stamp_content(args.abbreviations, stamp_options, args.registry) if stamp_path else ""
+    if stamp_path and not args.force and not args.watch and (keys_dir / "keys.h").exists():
+        try:
+            up_to_date = stamp_path.read_text(encoding="utf-8") == stamp_content
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            if args.depfile:
+                write_depfile(pathlib.Path(args.depfile), depfile_target, args.abbreviations, args.registry)
+            print(f"Headers are up to date (stamp: {stamp_path}). Use --force to regenerate.")
+            if args.pch and build_precompiled_header(keys_dir, args.pch, shlex.split(args.pch_flags)) is None:
+                return 1
+            return 0
     
     try:
         # Create the full path 'headers/keys/blocks'
@@ -753,21 +2349,83 @@ def main() -> int:
     except OSError as e:
         print(f"Error creating output directory '{blocks_dir}': {e}", file=sys.stderr)
         return 1
+
+    if args.watch:
+        session = WatchSession(blocks_dir, args.abbreviations, args.write_jobs, args.chunk_threshold, args.chunk_size)
+        return run_watch(session, args.watch_interval)
         
-    generator = MacroGenerator()
+    registry = load_name_registry(args.registry) if args.registry else {}
+    generator = MacroGenerator(config=config, registry=registry)
+    # Names of code points no longer generated stay registered, so they are never reused
+    assigned_names: Dict[int, str] = dict(registry)
+
+    emitters = [EMITTERS[target](emit_dir) for target in emit_targets]
+    if emitters:
+        try:
+            emit_dir.mkdir(exist_ok=True, parents=True)
+        except OSError as e:
+            print(f"Error creating output directory '{emit_dir}': {e}", file=sys.stderr)
+            return 1
 
     print(f"Generating C headers for Unicode (Properties: {UNICODE_VERSION} / Blocks: {UNICODE_BLOCK_VERSION})...")
 
-    # Pass 1: Generate block headers and collect names
-    for u_block in get_all_blocks():
-        # emit_header now returns the filename if successful, or None
-        filename = emit_header(u_block, blocks_dir, generator)
-        if filename:
-            generated_block_files.append(filename) # Only add if successfully written
+    # Pass 1: Generate block headers and collect names. Writes overlap with
+    # generation of the next block; leaving the 'with' flushes every write.
+    try:
+        with HeaderWriter(max_workers=args.write_jobs) as writer:
+            for u_block in get_all_blocks():
+                # Resolve the names once (or claim them from the shard files) and feed the same entries to every target
+                if shard_rows is not None:
+                    entries = merge_shard_entries(shard_rows[u_block.name], generator)
+                else:
+                    entries = build_block_entries(u_block, generator.get_block_abbr(u_block.name), generator)
+                if args.registry:
+                    assigned_names.update((entry.cp1, entry.macro_name) for entry in entries)
+                for emitter in emitters:
+                    emitter.add_block(u_block, entries)
+                # emit_header now returns the filename if successful, or None
+                filename = emit_header(u_block, blocks_dir, generator, writer, args.chunk_threshold, args.chunk_size, entries=entries)
+                if filename:
+                    generated_block_files.append(filename) # Only add if successfully written
+    except OSError as e:
+        print(f"Error writing header file: {e}", file=sys.stderr)
+        return 1
         
     # Pass 2: Generate the master keys.h using ONLY the collected filenames
     generate_keys_header(keys_dir, generated_block_files)
 
+    for emitter in emitters:
+        status = "written" if emitter.finish() else "unchanged"
+        print(f"Extra output {status}: {emitter.path}")
+
+    if args.registry:
+        try:
+            changed = write_if_changed(pathlib.Path(args.registry), build_name_registry_content(assigned_names))
+        except OSError as e:
+            print(f"Error writing name registry '{args.registry}': {e}", file=sys.stderr)
+            return 1
+        new_names = len(assigned_names) - len(registry)
+        print(f"Name registry {'written' if changed else 'unchanged'}: {args.registry} ({new_names} new code points)")
+
+    pch: Optional[pathlib.Path] = None
+    if args.pch:
+        pch_flags = shlex.split(args.pch_flags)
+        pch = build_precompiled_header(keys_dir, args.pch, pch_flags)
+    # A PCH that was not rebuilt from the headers just written must not shadow them
+    remove_stale_precompiled_headers(keys_dir, keep=pch)
+    if args.pch and pch is None:
+        return 1
+    if pch is not None and args.pch_benchmark > 0:
+        benchmark_precompiled_header(keys_dir, args.pch, pch_flags, pch, args.pch_benchmark)
+
+    if stamp_path:
+        if args.registry:
+            # The run may have added names to the registry; stamp the state it left behind
+            stamp_content = build_stamp_content(args.abbreviations, stamp_options, args.registry)
+        write_if_changed(stamp_path, stamp_content)
+    if args.depfile:
+        write_depfile(pathlib.Path(args.depfile), depfile_target, args.abbreviations, args.registry)
+
     print("\nAll files written. Final structure:")
     print(f" - Block headers written to: {blocks_dir.resolve()}")
     print(f" - Master keys.h written to: {keys_dir.resolve()}")
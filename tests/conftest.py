@@ -0,0 +1,44 @@
+"""
+Shared fixtures: the tests run the generator on a small subset of the blocks.
+"""
+import json
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_unicode_headers as guh  # noqa: E402
+
+# Blocks whose names are affected by the rule edits in the tests (kept small for speed)
+BLOCK_NAMES = [
+    "Basic Latin",
+    "Latin-1 Supplement",
+    "Greek and Coptic",
+    "Letterlike Symbols",
+    "Enclosed Alphanumerics",
+    "Halfwidth and Fullwidth Forms",
+    "Mathematical Alphanumeric Symbols",
+    "Ornamental Dingbats",
+]
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    """Writes a reduced block index and an abbreviation config, and points the generator at them."""
+    with open(ROOT / guh.BLOCKS_DATA_FILE, "r", encoding="utf-8") as f:
+        block_data = json.load(f)
+    block_data["blocks"] = [b for b in block_data["blocks"] if b["name"] in BLOCK_NAMES]
+
+    blocks_file = tmp_path / "unicode_blocks.json"
+    config_file = tmp_path / "abbreviations.json"
+    blocks_file.write_text(json.dumps(block_data), encoding="utf-8")
+    config_file.write_text("{}", encoding="utf-8")
+
+    monkeypatch.setattr(guh, "BLOCKS_DATA_FILE", str(blocks_file))
+    monkeypatch.setattr(guh, "BLOCK_DESCRIPTIONS_FILE", str(ROOT / guh.BLOCK_DESCRIPTIONS_FILE))
+    guh.reset_block_data()
+    yield tmp_path, blocks_file, config_file, block_data
+    guh.reset_block_data()
@@ -0,0 +1,30 @@
+"""
+The hex-suffix shortcut of AbbreviationEngine must not change any name.
+"""
+import pytest
+import unicodedata2
+
+import generate_unicode_headers as guh
+
+# Code point ranges with hex-suffixed names (ideographs, Tangut) and without
+RANGES = [(0x0000, 0x0500), (0x2100, 0x2200), (0x4E00, 0x5000), (0xF900, 0xFB00), (0x17000, 0x17100), (0x1D400, 0x1D500)]
+NAMES = [unicodedata2.name(chr(cp), "") for start, end in RANGES for cp in range(start, end)]
+
+CONFIGS = [
+    {},
+    {"replacements": {"IDEOGRAPH": "IDG", "UNIFIED": "U-"}, "redundant_words": ["CJK", "4E00"]},
+    {"redundant_words": ["IDEOGRAPH", "TANGUT"], "case_words": ["CJK"]},
+    # Keys that can match across the hyphen or inside the hex digits disable the shortcut
+    {"replacements": {"PH-": "X"}},
+    {"replacements": {"4E": "X"}},
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_hex_suffix_split_matches_full_abbreviation(config):
+    engine = guh.MacroGenerator(config=config).engine
+    reference = guh.MacroGenerator(config=config).engine
+    reference._split_hex_suffix = False
+    for name in NAMES:
+        for strip_case in (False, True):
+            assert engine.abbreviate(name, strip_case) == reference.abbreviate(name, strip_case), name
@@ -0,0 +1,79 @@
+"""
+The --registry file keeps macro names stable across rule changes, and
+malformed registries are rejected before anything is generated.
+"""
+import json
+import re
+import sys
+
+import pytest
+
+import generate_unicode_headers as guh
+
+RULES_BEFORE = {}
+RULES_AFTER = {"replacements": {"CAPITAL": "CAP"}, "redundant_words": ["SS", "DS"], "case_words": ["TURNED"]}
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["generate_unicode_headers.py", "-j", "0", *map(str, args)])
+    assert guh.main() == 0
+
+
+def defined_names(blocks_dir):
+    """Returns {first code point: macro name} of every #define in the block headers."""
+    pattern = re.compile(r"^#define (\w+)\s+0x([0-9A-F]+)", re.MULTILINE)
+    return {
+        int(cp_hex, 16): name
+        for path in blocks_dir.glob("*.h")
+        for name, cp_hex in pattern.findall(path.read_text(encoding="utf-8"))
+    }
+
+
+def test_names_survive_rule_changes(inputs, monkeypatch, capsys):
+    tmp_path, _, config_file, _ = inputs
+    registry_file = tmp_path / "names.json"
+    runs = {}
+    for label, rules, registry in [
+        ("before", RULES_BEFORE, registry_file),
+        ("after", RULES_AFTER, registry_file),
+        ("unregistered", RULES_AFTER, None),
+    ]:
+        blocks_dir = tmp_path / label / "keys" / "blocks"
+        blocks_dir.mkdir(parents=True)
+        config_file.write_text(json.dumps(rules), encoding="utf-8")
+        run_main(monkeypatch, "-o", blocks_dir, "-a", config_file, *(["--registry", registry] if registry else []))
+        runs[label] = defined_names(blocks_dir)
+
+    # The rule change does rename macros without a registry ...
+    assert runs["unregistered"] != runs["before"]
+    # ... but not with one, and the registry records exactly those names
+    assert runs["after"] == runs["before"]
+    assert guh.load_name_registry(str(registry_file)) == runs["before"]
+
+
+def test_registry_round_trip(tmp_path):
+    registry = {0x41: "UC_LA_A", 0x1F600: "UC_EMJ_GRINNING_FACE"}
+    path = tmp_path / "names.json"
+    path.write_text(guh.build_name_registry_content(registry), encoding="utf-8")
+    assert guh.load_name_registry(str(path)) == registry
+    assert guh.load_name_registry(str(tmp_path / "missing.json")) == {}
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    json.dumps([]),
+    json.dumps({"format": 99, "names": {}}),
+    json.dumps({"format": guh.NAME_REGISTRY_FORMAT, "names": []}),
+    json.dumps({"format": guh.NAME_REGISTRY_FORMAT, "names": {"XYZ": "UC_X"}}),
+    json.dumps({"format": guh.NAME_REGISTRY_FORMAT, "names": {"0041": "UC LA A"}}),
+    json.dumps({"format": guh.NAME_REGISTRY_FORMAT, "names": {"0041": "1UC_LA_A"}}),
+    json.dumps({"format": guh.NAME_REGISTRY_FORMAT, "names": {"0041": 65}}),
+    json.dumps({"format": guh.NAME_REGISTRY_FORMAT, "names": {"0041": "UC_A", "0061": "UC_A"}}),
+])
+def test_invalid_registry_is_rejected(tmp_path, capsys, content):
+    path = tmp_path / "names.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(SystemExit) as excinfo:
+        guh.load_name_registry(str(path))
+    assert excinfo.value.code == 1
+    assert "Error:" in capsys.readouterr().err
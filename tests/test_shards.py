@@ -0,0 +1,51 @@
+"""
+Merging the --shard partial outputs must give byte-identical headers to a
+serial run, for any shard count.
+"""
+import json
+import sys
+
+import pytest
+
+import generate_unicode_headers as guh
+from conftest import BLOCK_NAMES
+
+# One shared block prefix and extra redundant words make many names collide
+# across blocks, and so across shards (over a hundred with 3 shards)
+RULES = {
+    "block_abbreviations": {name.upper(): "X" for name in BLOCK_NAMES},
+    "redundant_words": ["MS", "DS", "SS", "SC", "FR", "FW", "C", "P", "BOLD", "IT"],
+}
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["generate_unicode_headers.py", "-j", "0", *map(str, args)])
+    assert guh.main() == 0
+
+
+def read_tree(keys_dir):
+    return {str(p.relative_to(keys_dir)): p.read_bytes() for p in sorted(keys_dir.rglob("*.h"))}
+
+
+@pytest.mark.parametrize("shard_count", [1, 3])
+def test_merged_shards_match_serial_run(inputs, monkeypatch, capsys, shard_count):
+    tmp_path, _, config_file, _ = inputs
+    config_file.write_text(json.dumps(RULES), encoding="utf-8")
+
+    serial_dir = tmp_path / "serial" / "keys" / "blocks"
+    serial_dir.mkdir(parents=True)
+    run_main(monkeypatch, "-o", serial_dir, "-a", config_file)
+
+    shard_files = []
+    for index in range(1, shard_count + 1):
+        shard_file = tmp_path / f"shard_{index}.json"
+        run_main(monkeypatch, "--shard", f"{index}/{shard_count}", "--shard-output", shard_file, "-a", config_file)
+        shard_files.append(shard_file)
+
+    merged_dir = tmp_path / "merged" / "keys" / "blocks"
+    merged_dir.mkdir(parents=True)
+    run_main(monkeypatch, "-o", merged_dir, "-a", config_file, "--merge-shards", *shard_files)
+
+    serial = read_tree(serial_dir.parent)
+    assert "keys.h" in serial and len(serial) > 1
+    assert read_tree(merged_dir.parent) == serial
@@ -0,0 +1,69 @@
+"""
+Watch mode must produce exactly what a from-scratch run produces after any
+sequence of input edits.
+"""
+import json
+import pathlib
+
+import generate_unicode_headers as guh
+
+RULE_EDITS = [
+    {"redundant_words": ["MS", "DS"]},
+    {},
+    {"redundant_words": ["SS"]},
+    {},
+    {"replacements": {"CAPITAL": "CAP"}},
+    {"case_words": ["TURNED"]},
+    {"replacements": {"DOUBLE-STRUCK": "DBL"}, "redundant_words": ["SC", "FW"]},
+    {"redundant_words": ["DBL"]},
+    {},
+]
+
+
+def read_tree(keys_dir: pathlib.Path):
+    return {str(p.relative_to(keys_dir)): p.read_bytes() for p in sorted(keys_dir.rglob("*.h"))}
+
+
+def fresh_tree(tmp_path: pathlib.Path, config_file: pathlib.Path, run: int):
+    """Generates everything from scratch into a new directory and returns its files."""
+    blocks_dir = tmp_path / f"fresh_{run}" / "keys" / "blocks"
+    blocks_dir.mkdir(parents=True)
+    guh.WatchSession(blocks_dir, str(config_file), write_jobs=0).regenerate()
+    return read_tree(blocks_dir.parent)
+
+
+def test_rule_edits_match_fresh_run(inputs, capsys):
+    tmp_path, _, config_file, _ = inputs
+    blocks_dir = tmp_path / "watch" / "keys" / "blocks"
+    blocks_dir.mkdir(parents=True)
+    session = guh.WatchSession(blocks_dir, str(config_file), write_jobs=0)
+    session.regenerate()
+
+    for run, config in enumerate(RULE_EDITS):
+        config_file.write_text(json.dumps(config), encoding="utf-8")
+        session.regenerate()
+        assert read_tree(blocks_dir.parent) == fresh_tree(tmp_path, config_file, run), f"after edit {run}: {config}"
+
+
+def test_block_range_change_matches_fresh_run(inputs, capsys):
+    tmp_path, blocks_file, config_file, block_data = inputs
+    blocks_dir = tmp_path / "watch" / "keys" / "blocks"
+    blocks_dir.mkdir(parents=True)
+    session = guh.WatchSession(blocks_dir, str(config_file), write_jobs=0)
+    session.regenerate()
+
+    # Shrink a block, then apply a rule that only affects the removed part, then restore it
+    letterlike = next(b for b in block_data["blocks"] if b["name"] == "Letterlike Symbols")
+    original_end = letterlike["end"]
+    steps = [
+        ({"end": "2110"}, {}),
+        ({"end": "2110"}, {"redundant_words": ["DS"]}),
+        ({"end": original_end}, {"redundant_words": ["DS"]}),
+        ({"end": original_end}, {}),
+    ]
+    for run, (change, config) in enumerate(steps):
+        letterlike.update(change)
+        blocks_file.write_text(json.dumps(block_data), encoding="utf-8")
+        config_file.write_text(json.dumps(config), encoding="utf-8")
+        session.regenerate()
+        assert read_tree(blocks_dir.parent) == fresh_tree(tmp_path, config_file, run), f"after step {run}"